@@ -0,0 +1,147 @@
+# Detección de anomalías sobre todas las series diarias tienda x familia
+import numpy as np
+import pandas as pd
+
+# Factor que hace la MAD comparable a la desviación típica de una normal
+FACTOR_MAD = 0.6745
+
+
+def construir_matriz(df):
+    # Matriz días x series (tienda, familia) con NaN en los días sin registro
+    datos = df.dropna(subset=['date'])
+    diario = datos.groupby(['date', 'store_nbr', 'family'])['sales'].sum()
+
+    fechas = pd.date_range(datos['date'].min(), datos['date'].max(), freq='D')
+    series = diario.index.droplevel('date').unique().sort_values()
+
+    filas = fechas.get_indexer(diario.index.get_level_values('date'))
+    columnas = series.get_indexer(diario.index.droplevel('date'))
+
+    matriz = np.full((len(fechas), len(series)), np.nan)
+    matriz[filas, columnas] = diario.to_numpy(dtype=np.float64)
+
+    return matriz, fechas, series
+
+
+def huella(df, hasta=None):
+    # Resumen de las filas que entran en la matriz (hasta una fecha, incluida): número de
+    # filas y suma de sus hashes, que no depende del orden. Cambia si se corrige, añade o
+    # elimina alguna fila.
+    datos = df[df['date'].notna()]
+    if hasta is not None:
+        datos = datos[datos['date'] <= hasta]
+    hashes = pd.util.hash_pandas_object(datos[['date', 'store_nbr', 'family', 'sales']], index=False)
+    return len(datos), int(hashes.to_numpy().sum())
+
+
+def puntuaciones_robustas(matriz, ventana=28, min_obs=7, mad_minima=1.0):
+    # z-score robusto de cada día frente a los `ventana` días anteriores (sin incluirlo):
+    # mediana móvil como valor esperado y MAD móvil como dispersión.
+    # Las ventanas móviles se calculan a la vez para todas las columnas (series).
+    # El mínimo de observaciones no puede superar la ventana
+    min_obs = min(min_obs, ventana)
+    valores = pd.DataFrame(matriz)
+    base = valores.shift(1).rolling(ventana, min_periods=min_obs).median()
+    desvio = (valores - base).abs()
+    mad = desvio.shift(1).rolling(ventana, min_periods=min_obs).median()
+
+    # Suelo para la MAD: evita z infinitos en series casi constantes (p. ej. siempre 0).
+    # np.maximum conserva los NaN: un día sin MAD todavía (arranque de la serie) no se puntúa
+    mad = np.maximum(mad.to_numpy(), mad_minima)
+    z = FACTOR_MAD * (matriz - base.to_numpy()) / mad
+
+    return z, base.to_numpy()
+
+
+def calcular_estado(df, ventana=28, min_obs=7, mad_minima=1.0):
+    matriz, fechas, series = construir_matriz(df)
+    z, base = puntuaciones_robustas(matriz, ventana, min_obs, mad_minima)
+
+    return {
+        'matriz': matriz,
+        'fechas': fechas,
+        'series': series,
+        'z': z,
+        'base': base,
+        'parametros': (ventana, min_obs, mad_minima)
+    }
+
+
+def actualizar_estado(estado, df_nuevo):
+    # Incorpora registros nuevos y recalcula solo las filas afectadas.
+    # El z de un día depende de los 2 * ventana días anteriores (mediana y MAD),
+    # así que basta con recalcular desde ese margen antes del primer día modificado.
+    ventana, min_obs, mad_minima = estado['parametros']
+    matriz_nueva, fechas_nuevas, series_nuevas = construir_matriz(df_nuevo)
+
+    if matriz_nueva.size == 0:
+        return estado
+
+    fechas = estado['fechas'].union(fechas_nuevas)
+    fechas = pd.date_range(fechas.min(), fechas.max(), freq='D')
+    series = estado['series'].union(series_nuevas).sort_values()
+
+    # Reubicar la matriz anterior en la nueva rejilla (días y series ampliados)
+    matriz = np.full((len(fechas), len(series)), np.nan)
+    filas_prev = fechas.get_indexer(estado['fechas'])
+    columnas_prev = series.get_indexer(estado['series'])
+    matriz[np.ix_(filas_prev, columnas_prev)] = estado['matriz']
+
+    z = np.full_like(matriz, np.nan)
+    base = np.full_like(matriz, np.nan)
+    z[np.ix_(filas_prev, columnas_prev)] = estado['z']
+    base[np.ix_(filas_prev, columnas_prev)] = estado['base']
+
+    # Sumar los registros nuevos (pueden caer en días ya existentes)
+    filas = fechas.get_indexer(fechas_nuevas)
+    columnas = series.get_indexer(series_nuevas)
+    bloque = matriz[np.ix_(filas, columnas)]
+    matriz[np.ix_(filas, columnas)] = np.where(
+        np.isnan(matriz_nueva), bloque, np.nan_to_num(bloque) + np.nan_to_num(matriz_nueva)
+    )
+
+    primera = int(filas.min())
+    inicio = max(0, primera - 2 * ventana - 1)
+    z_tramo, base_tramo = puntuaciones_robustas(matriz[inicio:], ventana, min_obs, mad_minima)
+    z[primera:] = z_tramo[primera - inicio:]
+    base[primera:] = base_tramo[primera - inicio:]
+
+    return {
+        'matriz': matriz,
+        'fechas': fechas,
+        'series': series,
+        'z': z,
+        'base': base,
+        'parametros': estado['parametros']
+    }
+
+
+def ranking_alertas(estado, umbral=3.5, tipo='Todas'):
+    # Tabla de alertas ordenada por |z| descendente
+    z = estado['z']
+    with np.errstate(invalid='ignore'):
+        if tipo == 'Caídas':
+            marcadas = z <= -umbral
+        elif tipo == 'Picos':
+            marcadas = z >= umbral
+        else:
+            marcadas = np.abs(z) >= umbral
+
+    filas, columnas = np.nonzero(marcadas)
+    valores_z = z[filas, columnas]
+    orden = np.argsort(-np.abs(valores_z), kind='stable')
+    filas, columnas, valores_z = filas[orden], columnas[orden], valores_z[orden]
+
+    series = estado['series']
+    alertas = pd.DataFrame({
+        'date': estado['fechas'][filas],
+        'store_nbr': series.get_level_values('store_nbr')[columnas],
+        'family': series.get_level_values('family')[columnas],
+        'sales': estado['matriz'][filas, columnas],
+        'esperado': estado['base'][filas, columnas],
+        'z': valores_z
+    })
+    alertas['desviacion'] = alertas['sales'] - alertas['esperado']
+    alertas['tipo'] = np.where(valores_z < 0, 'Caída', 'Pico')
+
+    return alertas
@@ -0,0 +1,250 @@
+# ===========================================
+# API JSON LOCAL CON LAS MÉTRICAS DEL DASHBOARD
+# ===========================================
+# Servicio HTTP ligero (solo biblioteca estándar) que expone las mismas agregaciones
+# que muestra el dashboard. Las respuestas se guardan en una caché LRU en memoria y
+# llevan un ETag ligado a la versión de los datos: si los CSV cambian, cambian los
+# ETag y la caché se vacía.
+#
+# Uso: python api.py [--host 127.0.0.1] [--puerto 8502]
+#
+# Endpoints (todos aceptan ?store=, ?state=, ?desde=AAAA-MM-DD y ?hasta=AAAA-MM-DD):
+#   /api/familias-top?n=10    Top familias por ventas
+#   /api/promociones          Ventas totales, en promoción y porcentaje
+#   /api/ventas-estado        Ventas por estado
+#   /api/tendencia-mensual    Ventas mensuales con recta de tendencia
+#   /api/version              Versión de los datos
+#
+# Con DASHBOARD_FUENTE apuntando a una base de datos (ver basedatos.py) las agregaciones
+# se resuelven en la base de datos en lugar de cargar la tabla en memoria.
+import argparse
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+import metricas
+from cache import GestorCache
+from datos import fuente_sql, leer_datos, version_datos
+
+
+class ErrorParametro(ValueError):
+    pass
+
+
+class AlmacenDatos:
+    # Origen de las consultas y su versión. Con los CSV se cargan los datos en memoria y
+    # se recargan si cambia la versión; con una base de datos las consultas van directas.
+    def __init__(self, cache):
+        self.cache = cache
+        self._lock = threading.Lock()
+        # (origen, versión) se sustituyen juntos para que una petición nunca mezcle versiones
+        self._actual = (None, None)
+        self.comprobar_version()
+
+    def comprobar_version(self):
+        version = version_datos()
+        if version != self._actual[1]:
+            with self._lock:
+                if version != self._actual[1]:
+                    origen = fuente_sql()
+                    if origen is None:
+                        df, avisos = leer_datos()
+                        for aviso in avisos:
+                            print(aviso)
+                        origen = metricas.OrigenMemoria(df) if not df.empty else None
+                    self._actual = (origen, version)
+                    self.cache.vaciar()
+        return self._actual
+
+
+# ===========================================
+# PARÁMETROS Y ENDPOINTS
+# ===========================================
+def _fecha(valor, nombre):
+    try:
+        return pd.Timestamp(valor)
+    except (ValueError, TypeError):
+        raise ErrorParametro(f"'{nombre}' debe ser una fecha AAAA-MM-DD")
+
+
+def leer_filtros(parametros):
+    filtros = {}
+    if 'store' in parametros:
+        try:
+            filtros['tienda'] = int(parametros['store'])
+        except ValueError:
+            raise ErrorParametro("'store' debe ser un número de tienda")
+    if 'state' in parametros:
+        filtros['estado'] = parametros['state']
+    if 'desde' in parametros:
+        filtros['desde'] = _fecha(parametros['desde'], 'desde')
+    if 'hasta' in parametros:
+        filtros['hasta'] = _fecha(parametros['hasta'], 'hasta')
+    return filtros
+
+
+def _registros(tabla):
+    tabla = tabla.copy()
+    for col in tabla.columns:
+        if pd.api.types.is_datetime64_any_dtype(tabla[col]):
+            tabla[col] = tabla[col].dt.strftime('%Y-%m-%d')
+    return tabla.to_dict(orient='records')
+
+
+def endpoint_familias_top(origen, filtros, parametros):
+    try:
+        n = int(parametros.get('n', 10))
+    except ValueError:
+        raise ErrorParametro("'n' debe ser un entero")
+    if n < 1:
+        raise ErrorParametro("'n' debe ser mayor o igual que 1")
+    return _registros(origen.top_familias(n, **filtros))
+
+
+def endpoint_promociones(origen, filtros, parametros):
+    return origen.resumen_promocion(**filtros)
+
+
+def endpoint_ventas_estado(origen, filtros, parametros):
+    return _registros(origen.ventas_por_estado(**filtros))
+
+
+def endpoint_tendencia_mensual(origen, filtros, parametros):
+    ventas_mensuales = origen.tendencia_mensual(**filtros)
+    return {
+        'crecimiento_total': metricas.crecimiento_total(ventas_mensuales),
+        'meses': _registros(ventas_mensuales)
+    }
+
+
+ENDPOINTS = {
+    '/api/familias-top': endpoint_familias_top,
+    '/api/promociones': endpoint_promociones,
+    '/api/ventas-estado': endpoint_ventas_estado,
+    '/api/tendencia-mensual': endpoint_tendencia_mensual,
+}
+
+
+# ===========================================
+# SERVIDOR HTTP
+# ===========================================
+def huella_version(version):
+    return hashlib.sha1(repr(version).encode('utf-8')).hexdigest()[:12]
+
+
+def calcular_etag(version, clave):
+    return '"' + hashlib.sha1(repr((version, clave)).encode('utf-8')).hexdigest()[:20] + '"'
+
+
+class ManejadorAPI(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Cabeceras y cuerpo van en escrituras separadas: sin TCP_NODELAY, Nagle y el ACK
+    # retardado añaden ~40 ms a cada respuesta con conexiones persistentes
+    disable_nagle_algorithm = True
+    almacen = None
+
+    def log_message(self, formato, *args):
+        # Silenciar el registro por petición (penaliza mucho bajo carga)
+        pass
+
+    def _responder(self, estado, cuerpo=b'', etag=None):
+        self.send_response(estado)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.send_header('Cache-Control', 'no-cache')
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        if cuerpo:
+            self.wfile.write(cuerpo)
+
+    def _error(self, estado, mensaje):
+        self._responder(estado, json.dumps({'error': mensaje}, ensure_ascii=False).encode('utf-8'))
+
+    def do_GET(self):
+        # Cualquier fallo inesperado (datos ilegibles, columna ausente, base de datos caída)
+        # se devuelve como un 500 en JSON en lugar de cortar la conexión
+        try:
+            self._atender()
+        except (BrokenPipeError, ConnectionResetError):
+            # El cliente ya cerró la conexión: no hay a quién responder
+            pass
+        except Exception as e:
+            self._error(500, f"Error interno: {type(e).__name__}: {e}")
+
+    def _atender(self):
+        url = urlparse(self.path)
+        parametros = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        origen, version = self.almacen.comprobar_version()
+        if origen is None:
+            self._error(503, "No se pudieron cargar los datos")
+            return
+
+        if url.path == '/api/version':
+            self._responder(200, json.dumps({'version': huella_version(version)}).encode('utf-8'))
+            return
+
+        endpoint = ENDPOINTS.get(url.path)
+        if endpoint is None:
+            self._error(404, f"Endpoint no encontrado: {url.path}")
+            return
+
+        clave = (url.path, tuple(sorted(parametros.items())))
+        etag = calcular_etag(version, clave)
+
+        # El ETag solo depende de la versión de los datos y de la petición:
+        # si el cliente ya tiene esa respuesta no hace falta ni consultar la caché
+        if self.headers.get('If-None-Match') == etag:
+            self._responder(304, etag=etag)
+            return
+
+        guardada = self.almacen.cache.obtener(clave)
+        if guardada is None or guardada[0] != etag:
+            try:
+                datos = endpoint(origen, leer_filtros(parametros), parametros)
+            except ErrorParametro as e:
+                self._error(400, str(e))
+                return
+
+            cuerpo = json.dumps(
+                {'version': huella_version(version), 'filtros': parametros, 'datos': datos},
+                ensure_ascii=False,
+                default=str
+            ).encode('utf-8')
+            guardada = (etag, cuerpo)
+            self.almacen.cache.guardar(clave, guardada)
+
+        self._responder(200, guardada[1], etag=guardada[0])
+
+
+def crear_servidor(host='127.0.0.1', puerto=8502, max_entradas=256, presupuesto_mb=64):
+    # Misma caché LRU con presupuesto en bytes que el dashboard, con su propia instancia
+    almacen = AlmacenDatos(GestorCache(presupuesto_bytes=presupuesto_mb * 1024 ** 2, max_entradas=max_entradas))
+    manejador = type('ManejadorAPIConDatos', (ManejadorAPI,), {'almacen': almacen})
+    return ThreadingHTTPServer((host, puerto), manejador)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API JSON local con las métricas del dashboard.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8502)
+    parser.add_argument('--cache', type=int, default=256, help="Máximo de respuestas en caché")
+    parser.add_argument('--cache-mb', type=int, default=64, help="Memoria máxima de la caché de respuestas (MB)")
+    args = parser.parse_args()
+
+    servidor = crear_servidor(args.host, args.puerto, args.cache, args.cache_mb)
+    print(f"API disponible en http://{args.host}:{args.puerto}/api/ (Ctrl+C para detener)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,451 @@
+# ===========================================
+# FUENTE DE DATOS EN BASE DE DATOS (SQLITE O CUALQUIER DB-API)
+# ===========================================
+# Alternativa a los CSV: las ventas se leen de una tabla relacional (con las mismas
+# columnas que los CSV, incluidas year y month) a través de un pool de conexiones.
+# Las agregaciones de la API (top familias, ventas por estado, promociones y tendencia
+# mensual) se resuelven en la base de datos con los filtros en el WHERE, de modo que
+# solo viaja el resultado agregado. Las páginas del dashboard se resuelven sobre un cubo
+# mensual (tienda x familia x mes) que se trae con una sola consulta (ver OrigenCubo).
+# La tabla completa solo se lee para los análisis registro a registro; las filas se
+# leen por lotes (fetchmany) y se vuelcan en arrays de NumPy con su tipo.
+#
+# Crear la base de datos local de prueba a partir de parte_1 y parte_2:
+#   python basedatos.py [--ruta data/ventas_muestra.sqlite]
+# Usarla en el dashboard, la API y los informes:
+#   DASHBOARD_FUENTE=sqlite:///data/ventas_muestra.sqlite streamlit run streamlit_app.py
+import argparse
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+import metricas
+
+RUTA_FIXTURE = os.path.join('data', 'ventas_muestra.sqlite')
+TABLA_VENTAS = 'ventas'
+
+# Tipo de cada columna numérica al leerla; el resto se lee como texto (object)
+TIPOS_COLUMNAS = {
+    'id': np.int64,
+    'store_nbr': np.int64,
+    'cluster': np.int64,
+    'sales': np.float64,
+    'onpromotion': np.float64,
+    'transactions': np.float64,
+    'dcoilwtico': np.float64,
+    'year': np.int64,
+    'month': np.int64,
+    'week': np.int64,
+    'quarter': np.int64,
+    # Resultados de agregaciones (NaN si no hay filas)
+    'filas': np.int64,
+    'ventas_totales': np.float64,
+    'ventas_promocion': np.float64
+}
+
+TAMANO_LOTE = 50_000
+
+# Claves del cubo mensual con el que el dashboard resuelve sus páginas (ver OrigenCubo).
+# Empiezan por columnas que no encabezan ningún índice: si no, SQLite agrupa recorriendo
+# idx_ventas_tienda con un acceso a la tabla por fila, más lento que leerla en orden.
+CLAVES_CUBO = ['family', 'year', 'month', 'store_nbr', 'state', 'city', 'store_type', 'cluster']
+
+# Equivalente SQL de las funciones de metricas.OrigenMemoria.agrupar. 'first' usa MIN:
+# solo se aplica a columnas constantes por grupo (ciudad, estado o tipo de una tienda)
+FUNCIONES_SQL = {
+    'sum': 'COALESCE(SUM({col}), 0)',
+    'mean': 'AVG({col})',
+    'nunique': 'COUNT(DISTINCT {col})',
+    'first': 'MIN({col})',
+    'count': 'COUNT({col})',
+    'size': 'COUNT(*)'
+}
+
+# Índices de la tabla de ventas: uno por filtro de la API (tienda, estado, fecha), que
+# incluyen las columnas que agregan las consultas para no tener que leer la tabla
+INDICES = {
+    'idx_ventas_tienda': ['store_nbr', 'date', 'family', 'sales', 'onpromotion', 'year', 'month'],
+    'idx_ventas_estado': ['state', 'date', 'family', 'sales', 'onpromotion', 'year', 'month'],
+    'idx_ventas_fecha': ['date', 'state', 'family', 'sales', 'onpromotion', 'year', 'month']
+}
+
+
+class PoolConexiones:
+    # Pool de conexiones DB-API de tamaño fijo: se crean bajo demanda y se reutilizan
+    def __init__(self, crear_conexion, tamano=4, espera=30):
+        self._crear_conexion = crear_conexion
+        self.tamano = tamano
+        self.espera = espera
+        self._libres = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self.creadas = 0
+
+    @contextmanager
+    def conexion(self):
+        conexion = self._tomar()
+        try:
+            yield conexion
+        except Exception:
+            # La conexión puede haber quedado en mal estado: se descarta
+            self._descartar(conexion)
+            raise
+        else:
+            self._libres.put(conexion)
+
+    def _tomar(self):
+        try:
+            return self._libres.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            crear = self.creadas < self.tamano
+            if crear:
+                self.creadas += 1
+        if crear:
+            try:
+                return self._crear_conexion()
+            except Exception:
+                with self._lock:
+                    self.creadas -= 1
+                raise
+        try:
+            return self._libres.get(timeout=self.espera)
+        except queue.Empty:
+            raise TimeoutError(f"No hay conexiones libres en el pool tras {self.espera} s")
+
+    def _descartar(self, conexion):
+        try:
+            conexion.close()
+        except Exception:
+            pass
+        with self._lock:
+            self.creadas -= 1
+
+    def cerrar(self):
+        while True:
+            try:
+                self._descartar(self._libres.get_nowait())
+            except queue.Empty:
+                break
+
+
+def leer_por_lotes(cursor, tamano_lote=TAMANO_LOTE, tipos=TIPOS_COLUMNAS):
+    # Lee el resultado de una consulta con fetchmany y lo vuelca columna a columna en
+    # arrays tipados. Las columnas enteras con nulos pasan a float64 (NaN).
+    columnas = [d[0] for d in cursor.description]
+    partes = {col: [] for col in columnas}
+    while True:
+        filas = cursor.fetchmany(tamano_lote)
+        if not filas:
+            break
+        for col, valores in zip(columnas, zip(*filas)):
+            tipo = tipos.get(col, object)
+            try:
+                partes[col].append(np.array(valores, dtype=tipo))
+            except (TypeError, ValueError):
+                partes[col].append(np.array(valores, dtype=np.float64 if tipo is not object else object))
+    return {
+        col: np.concatenate(trozos) if trozos else np.array([], dtype=tipos.get(col, object))
+        for col, trozos in partes.items()
+    }
+
+
+class FuenteSQL:
+    # Tabla de ventas en una base de datos DB-API. `marcador` es el parámetro de
+    # sustitución del driver ('?' en sqlite3, '%s' en psycopg2 o pymysql).
+    def __init__(self, pool, tabla=TABLA_VENTAS, marcador='?', ruta=None):
+        self.pool = pool
+        self.tabla = tabla
+        self.marcador = marcador
+        self.ruta = ruta
+        self._columnas = None
+
+    def consultar(self, sql, parametros=(), tamano_lote=TAMANO_LOTE):
+        with self.pool.conexion() as conexion:
+            cursor = conexion.cursor()
+            try:
+                cursor.execute(sql, parametros)
+                return pd.DataFrame(leer_por_lotes(cursor, tamano_lote), copy=False)
+            finally:
+                cursor.close()
+
+    def version(self):
+        # Misma forma que datos.version_datos(): cambia si cambian los datos
+        if self.ruta is not None:
+            info = os.stat(self.ruta)
+            return ((self.ruta, info.st_mtime_ns, info.st_size),)
+        resultado = self.consultar(f"SELECT COUNT(*) AS filas, MAX(date) AS ultima FROM {self.tabla}")
+        return ((self.tabla, int(resultado['filas'].iloc[0]), resultado['ultima'].iloc[0]),)
+
+    @property
+    def columnas(self):
+        if self._columnas is None:
+            with self.pool.conexion() as conexion:
+                cursor = conexion.cursor()
+                try:
+                    cursor.execute(f"SELECT * FROM {self.tabla} WHERE 1 = 0")
+                    self._columnas = [d[0] for d in cursor.description]
+                finally:
+                    cursor.close()
+        return self._columnas
+
+    def _where(self, tienda=None, estado=None, desde=None, hasta=None, condiciones=()):
+        # Mismos filtros que metricas.filtrar, con las fechas como texto ISO comparable
+        condiciones, parametros = list(condiciones), []
+        if tienda is not None:
+            condiciones.append(f"store_nbr = {self.marcador}")
+            parametros.append(int(tienda))
+        if estado is not None:
+            condiciones.append(f"state = {self.marcador}")
+            parametros.append(estado)
+        if desde is not None:
+            condiciones.append(f"date >= {self.marcador}")
+            parametros.append(pd.Timestamp(desde).strftime('%Y-%m-%d'))
+        if hasta is not None:
+            condiciones.append(f"date <= {self.marcador}")
+            parametros.append(pd.Timestamp(hasta).strftime('%Y-%m-%d'))
+        return (" WHERE " + " AND ".join(condiciones) if condiciones else ""), tuple(parametros)
+
+    # Lectura completa para el dashboard
+    def leer_ventas(self, tamano_lote=TAMANO_LOTE):
+        return self.consultar(f"SELECT * FROM {self.tabla}", tamano_lote=tamano_lote)
+
+    # Agregaciones resueltas en la base de datos (mismo resultado que las de metricas)
+    def resumen(self):
+        columnas = self.columnas
+        partes = ["COUNT(*) AS registros"]
+        if 'date' in columnas:
+            partes += ["MIN(date) AS desde", "MAX(date) AS hasta"]
+        for clave, col in [('tiendas', 'store_nbr'), ('estados', 'state'), ('familias', 'family'), ('meses', 'month')]:
+            if col in columnas:
+                partes.append(f"COUNT(DISTINCT {col}) AS {clave}")
+        if 'sales' in columnas:
+            partes.append("COALESCE(SUM(sales), 0) AS ventas")
+        fila = self.consultar(f"SELECT {', '.join(partes)} FROM {self.tabla}").iloc[0]
+
+        datos = {'registros': int(fila['registros'])}
+        if 'date' in columnas and fila['desde'] is not None:
+            datos['periodo'] = (pd.Timestamp(fila['desde']).date(), pd.Timestamp(fila['hasta']).date())
+        for clave in ['tiendas', 'estados', 'familias', 'meses']:
+            if clave in fila.index:
+                datos[clave] = int(fila[clave])
+        if 'ventas' in fila.index:
+            datos['ventas'] = float(fila['ventas'])
+        return datos
+
+    def agrupar(self, claves, agregaciones, solo_promocion=False, incluir_nulos=False, **filtros):
+        # Mismo resultado que metricas.OrigenMemoria.agrupar (índice por las claves, ordenado).
+        # Los grupos con claves nulas se descartan después: un IS NOT NULL en el WHERE hace
+        # que SQLite recorra un índice con accesos aleatorios a la tabla.
+        condiciones = ["onpromotion > 0"] if solo_promocion else []
+        where, parametros = self._where(condiciones=condiciones, **filtros)
+        expresiones = [
+            f"{FUNCIONES_SQL[funcion].format(col=col)} AS {nombre}"
+            for nombre, (col, funcion) in agregaciones.items()
+        ]
+        resultado = self.consultar(
+            f"SELECT {', '.join(claves + expresiones)} FROM {self.tabla}{where} GROUP BY {', '.join(claves)}",
+            parametros
+        )
+        for nombre, (col, funcion) in agregaciones.items():
+            if funcion != 'first':
+                resultado[nombre] = pd.to_numeric(resultado[nombre])
+        if not incluir_nulos:
+            resultado = resultado.dropna(subset=claves)
+        return resultado.set_index(claves).sort_index()
+
+    def cubo_mensual(self):
+        # Ventas, transacciones, ventas en promoción y registros por tienda x familia x mes
+        # (con los datos de la tienda), en una sola consulta. Tiene decenas de miles de filas
+        # aunque la tabla tenga millones.
+        claves = [col for col in CLAVES_CUBO if col in self.columnas]
+        medidas = [
+            "COUNT(*) AS registros",
+            "COALESCE(SUM(sales), 0) AS sales",
+            "COALESCE(SUM(CASE WHEN onpromotion > 0 THEN sales ELSE 0 END), 0) AS ventas_promocion",
+            "SUM(CASE WHEN onpromotion > 0 THEN 1 ELSE 0 END) AS registros_promocion"
+        ]
+        if 'transactions' in self.columnas:
+            medidas.append("COALESCE(SUM(transactions), 0) AS transactions")
+        cubo = self.consultar(
+            f"SELECT {', '.join(claves + medidas)} FROM {self.tabla} GROUP BY {', '.join(claves)}"
+        )
+        for col in ['registros', 'registros_promocion', 'sales', 'ventas_promocion', 'transactions']:
+            if col in cubo.columns:
+                cubo[col] = pd.to_numeric(cubo[col])
+        return cubo
+
+    def top_familias(self, n=10, **filtros):
+        where, parametros = self._where(**filtros)
+        return self.consultar(
+            f"SELECT family, SUM(sales) AS sales FROM {self.tabla}{where} "
+            f"GROUP BY family ORDER BY sales DESC LIMIT {int(n)}",
+            parametros
+        )
+
+    def ventas_por_estado(self, **filtros):
+        where, parametros = self._where(**filtros)
+        return self.consultar(
+            f"SELECT state, SUM(sales) AS sales FROM {self.tabla}{where} GROUP BY state ORDER BY sales DESC",
+            parametros
+        )
+
+    def resumen_promocion(self, **filtros):
+        where, parametros = self._where(**filtros)
+        resultado = self.consultar(
+            f"SELECT SUM(sales) AS ventas_totales, "
+            f"SUM(CASE WHEN onpromotion > 0 THEN sales ELSE 0 END) AS ventas_promocion "
+            f"FROM {self.tabla}{where}",
+            parametros
+        )
+        ventas_totales = float(np.nan_to_num(resultado['ventas_totales'].iloc[0]))
+        ventas_promocion = float(np.nan_to_num(resultado['ventas_promocion'].iloc[0]))
+        return {
+            'ventas_totales': ventas_totales,
+            'ventas_promocion': ventas_promocion,
+            'porcentaje_promocion': (ventas_promocion / ventas_totales) * 100 if ventas_totales > 0 else None
+        }
+
+    def tendencia_mensual(self, **filtros):
+        where, parametros = self._where(**filtros)
+        ventas_mensuales = self.consultar(
+            f"SELECT year, month, SUM(sales) AS sales FROM {self.tabla}{where} GROUP BY year, month",
+            parametros
+        )
+        return metricas.agregar_tendencia(ventas_mensuales)
+
+
+class OrigenCubo:
+    # Origen de las páginas del dashboard sobre una base de datos: el cubo mensual se trae
+    # con una sola consulta y las agregaciones de las páginas (mismas que
+    # metricas.OrigenMemoria) se resuelven sobre él. Las consultas con filtros de fecha,
+    # tienda o estado y las de grano diario van a la base de datos.
+    def __init__(self, fuente, cubo):
+        self.fuente = fuente
+        self.cubo = cubo
+
+    @property
+    def columnas(self):
+        return self.fuente.columnas
+
+    def resumen(self):
+        datos = {'registros': int(self.cubo['registros'].sum())}
+        if 'date' in self.columnas:
+            extremos = self.fuente.consultar(f"SELECT MIN(date) AS desde, MAX(date) AS hasta FROM {self.fuente.tabla}").iloc[0]
+            if extremos['desde'] is not None:
+                datos['periodo'] = (pd.Timestamp(extremos['desde']).date(), pd.Timestamp(extremos['hasta']).date())
+        for clave, col in [('tiendas', 'store_nbr'), ('estados', 'state'), ('familias', 'family'), ('meses', 'month')]:
+            if col in self.cubo.columns:
+                datos[clave] = self.cubo[col].nunique()
+        datos['ventas'] = float(self.cubo['sales'].sum())
+        return datos
+
+    def agrupar(self, claves, agregaciones, solo_promocion=False, incluir_nulos=False, **filtros):
+        # Sumas, recuentos de filas y valores distintos o primeros de las claves del cubo; el
+        # resto (filtros, medias, claves de grano diario) se resuelve en la base de datos
+        columnas_cubo = set(self.cubo.columns) - {'registros', 'registros_promocion', 'ventas_promocion'}
+        en_cubo = not filtros and set(claves) <= set(CLAVES_CUBO) and all(
+            (funcion == 'sum' and col in columnas_cubo and (col == 'sales' or not solo_promocion))
+            or (funcion in ('nunique', 'first') and col in CLAVES_CUBO)
+            or funcion == 'size'
+            for col, funcion in agregaciones.values()
+        )
+        if not en_cubo:
+            return self.fuente.agrupar(claves, agregaciones, solo_promocion, incluir_nulos, **filtros)
+
+        cubo = self.cubo[self.cubo['registros_promocion'] > 0] if solo_promocion else self.cubo
+        traduccion = {}
+        for nombre, (col, funcion) in agregaciones.items():
+            if funcion == 'size':
+                traduccion[nombre] = ('registros_promocion' if solo_promocion else 'registros', 'sum')
+            elif funcion == 'sum' and solo_promocion:
+                traduccion[nombre] = ('ventas_promocion', 'sum')
+            else:
+                traduccion[nombre] = (col, funcion)
+        return cubo.groupby(claves, dropna=not incluir_nulos).agg(**traduccion)
+
+    def top_familias(self, n=10, **filtros):
+        if filtros:
+            return self.fuente.top_familias(n, **filtros)
+        return metricas.top_familias(self.cubo, n).reset_index(drop=True)
+
+    def ventas_por_estado(self, **filtros):
+        if filtros:
+            return self.fuente.ventas_por_estado(**filtros)
+        return metricas.ventas_por_estado(self.cubo).reset_index(drop=True)
+
+    def resumen_promocion(self, **filtros):
+        if filtros:
+            return self.fuente.resumen_promocion(**filtros)
+        ventas_totales = float(self.cubo['sales'].sum())
+        ventas_promocion = float(self.cubo['ventas_promocion'].sum())
+        return {
+            'ventas_totales': ventas_totales,
+            'ventas_promocion': ventas_promocion,
+            'porcentaje_promocion': (ventas_promocion / ventas_totales) * 100 if ventas_totales > 0 else None
+        }
+
+    def tendencia_mensual(self, **filtros):
+        if filtros:
+            return self.fuente.tendencia_mensual(**filtros)
+        return metricas.tendencia_mensual(self.cubo)
+
+
+def abrir_fuente(url, tamano_pool=4):
+    # Fuente a partir de una URL. Incluye SQLite (sqlite:///ruta); para otro driver
+    # DB-API se construye FuenteSQL(PoolConexiones(lambda: driver.connect(...)), marcador=...)
+    if not url.startswith('sqlite:///'):
+        raise ValueError(f"Fuente no soportada: {url} (use sqlite:///ruta o construya FuenteSQL con su driver)")
+    ruta = url[len('sqlite:///'):]
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"No existe la base de datos {ruta} (créela con: python basedatos.py --ruta {ruta})")
+    pool = PoolConexiones(lambda: sqlite3.connect(ruta, check_same_thread=False), tamano=tamano_pool)
+    return FuenteSQL(pool, ruta=ruta)
+
+
+def crear_fixture_sqlite(ruta=RUTA_FIXTURE):
+    # Base de datos SQLite con los CSV de muestra ya validados (las agregaciones en la base
+    # de datos no pasan por la validación de ingesta) e índices para los filtros de la API
+    from datos import leer_csv, preparar_datos
+
+    df, avisos = preparar_datos(leer_csv())
+    for aviso in avisos:
+        print(aviso)
+    df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+    # SQLite guardaría los booleanos como 0/1: se guardan como texto, igual que en los CSV
+    if 'transferred' in df.columns:
+        df['transferred'] = df['transferred'].map({True: 'True', False: 'False'})
+
+    if os.path.exists(ruta):
+        os.remove(ruta)
+    os.makedirs(os.path.dirname(ruta) or '.', exist_ok=True)
+    with sqlite3.connect(ruta) as conexion:
+        df.to_sql(TABLA_VENTAS, conexion, index=False, chunksize=TAMANO_LOTE)
+        crear_indices(conexion)
+    return ruta, len(df)
+
+
+def crear_indices(conexion, tabla=TABLA_VENTAS):
+    for nombre, columnas in INDICES.items():
+        conexion.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({', '.join(columnas)})")
+    # Estadísticas para que el planificador elija el índice adecuado a cada filtro
+    conexion.execute("ANALYZE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crea la base de datos SQLite de prueba a partir de los CSV de muestra.")
+    parser.add_argument('--ruta', default=RUTA_FIXTURE, help=f"Archivo SQLite de salida (por defecto: {RUTA_FIXTURE})")
+    args = parser.parse_args()
+
+    ruta, filas = crear_fixture_sqlite(args.ruta)
+    print(f"✅ {filas:,} filas en la tabla '{TABLA_VENTAS}' de {ruta}")
+    print(f"Para usarla: DASHBOARD_FUENTE=sqlite:///{ruta} streamlit run streamlit_app.py")
+
+
+if __name__ == '__main__':
+    main()
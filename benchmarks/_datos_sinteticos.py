@@ -0,0 +1,37 @@
+# Generador común de los benchmarks: n registros al azar con el esquema de los CSV
+# (fecha, tienda con su ciudad, estado y tipo, familia, ventas, promociones,
+# transacciones, petróleo, año y mes). Cada benchmark se queda con las columnas que
+# usa y añade las suyas (festivos, errores inyectados, elasticidades conocidas...).
+import numpy as np
+import pandas as pd
+
+N_TIENDAS = 54
+FECHAS = pd.date_range('2013-01-01', '2017-08-15', freq='D')
+FAMILIAS = np.array([f"FAMILIA {i:02d}" for i in range(33)])
+
+# Datos de cada tienda, indexados por store_nbr (la posición 0 no se usa)
+CIUDADES = np.array([f"Ciudad {i % 22}" for i in range(N_TIENDAS + 1)])
+ESTADOS = np.array([f"Estado {i % 16}" for i in range(N_TIENDAS + 1)])
+TIPOS = np.array(list('ABCDE'))[np.arange(N_TIENDAS + 1) % 5]
+
+
+def generar_ventas(n, semilla=0, familias=FAMILIAS, fechas_texto=False):
+    # fechas_texto=True deja las fechas como en los CSV y la base de datos ('AAAA-MM-DD')
+    rng = np.random.default_rng(semilla)
+    fecha = FECHAS[rng.integers(0, len(FECHAS), n)]
+    tiendas = rng.integers(1, N_TIENDAS + 1, n)
+    familias = np.asarray(familias)
+    return pd.DataFrame({
+        'date': fecha.strftime('%Y-%m-%d') if fechas_texto else fecha,
+        'store_nbr': tiendas,
+        'family': familias[rng.integers(0, len(familias), n)],
+        'sales': rng.gamma(2.0, 50.0, n),
+        'onpromotion': rng.integers(0, 10, n) * (rng.random(n) < 0.3),
+        'transactions': rng.gamma(2.0, 800.0, n),
+        'dcoilwtico': rng.normal(70, 20, n),
+        'city': CIUDADES[tiendas],
+        'state': ESTADOS[tiendas],
+        'store_type': TIPOS[tiendas],
+        'year': fecha.year,
+        'month': fecha.month
+    })
@@ -0,0 +1,78 @@
+# Prueba de carga de la API JSON con clientes concurrentes
+# Escenarios: peticiones siempre distintas (fallo de caché), peticiones repetidas
+# (acierto de caché) y peticiones condicionales con If-None-Match (304).
+# Uso: python benchmarks/bench_api.py [n_clientes] [segundos_por_escenario]
+import http.client
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import api
+
+RUTAS = ['/api/familias-top', '/api/promociones', '/api/ventas-estado', '/api/tendencia-mensual']
+
+
+def cliente(puerto, generar_url, condicional, fin, latencias, contador):
+    conexion = http.client.HTTPConnection('127.0.0.1', puerto)
+    etags = {}
+    i = 0
+    while time.perf_counter() < fin:
+        url = generar_url(i)
+        cabeceras = {'If-None-Match': etags[url]} if condicional and url in etags else {}
+        t = time.perf_counter()
+        conexion.request('GET', url, headers=cabeceras)
+        respuesta = conexion.getresponse()
+        respuesta.read()
+        latencias.append(time.perf_counter() - t)
+        if respuesta.status not in (200, 304):
+            raise RuntimeError(f"{url}: {respuesta.status}")
+        etags[url] = respuesta.getheader('ETag')
+        i += 1
+    contador.append(i)
+    conexion.close()
+
+
+def escenario(nombre, puerto, n_clientes, segundos, generar_url, condicional=False):
+    latencias, contador = [], []
+    fin = time.perf_counter() + segundos
+    hilos = [
+        threading.Thread(target=cliente, args=(puerto, lambda i, c=c: generar_url(c, i), condicional, fin, latencias, contador))
+        for c in range(n_clientes)
+    ]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+
+    latencias = np.array(latencias) * 1000
+    print(f"{nombre:<28} {sum(contador) / duracion:>8,.0f} req/s | "
+          f"p50 {np.percentile(latencias, 50):6.2f} ms | p95 {np.percentile(latencias, 95):6.2f} ms")
+
+
+if __name__ == '__main__':
+    n_clientes = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    segundos = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+
+    servidor = api.crear_servidor('127.0.0.1', 0, max_entradas=10_000)
+    puerto = servidor.server_address[1]
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+
+    fechas = [str(d) for d in np.arange(np.datetime64('2013-01-01'), np.datetime64('2017-08-01'))]
+    print(f"{n_clientes} clientes concurrentes, {segundos:.0f} s por escenario")
+
+    escenario("Sin caché (URLs distintas)", puerto, n_clientes, segundos,
+              lambda c, i: f"{RUTAS[i % 4]}?desde={fechas[(c * 997 + i) % len(fechas)]}&c={c}&i={i}")
+    escenario("Con caché (URLs repetidas)", puerto, n_clientes, segundos,
+              lambda c, i: f"{RUTAS[i % 4]}?state=Pichincha")
+    escenario("Condicional (304)", puerto, n_clientes, segundos,
+              lambda c, i: f"{RUTAS[i % 4]}?state=Pichincha", condicional=True)
+
+    cache = servidor.RequestHandlerClass.almacen.cache
+    print(f"Caché: {len(cache)} entradas, {cache.aciertos:,} aciertos, {cache.fallos:,} fallos")
+    servidor.shutdown()
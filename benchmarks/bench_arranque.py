@@ -0,0 +1,47 @@
+# Mide el arranque en frío (proceso nuevo: imports + primera ejecución) y el coste
+# de cada rerun posterior del dashboard con el ejecutor de pruebas de Streamlit.
+# Uso: python benchmarks/bench_arranque.py [n_reruns]
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+SCRIPT = """
+import time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=300)
+t1 = time.perf_counter()
+at.run()
+t2 = time.perf_counter()
+reruns = []
+for _ in range({n}):
+    t = time.perf_counter()
+    at.run()
+    reruns.append(time.perf_counter() - t)
+reruns.sort()
+print(f"{{t2 - t1:.3f}} {{reruns[len(reruns) // 2]:.4f}}")
+"""
+
+
+def medir(n_reruns):
+    salida = subprocess.run(
+        [sys.executable, '-c', SCRIPT.format(app=str(RAIZ / 'streamlit_app.py'), n=n_reruns)],
+        cwd=RAIZ, capture_output=True, text=True, check=True
+    )
+    primera, rerun = salida.stdout.strip().splitlines()[-1].split()
+    return float(primera), float(rerun)
+
+
+if __name__ == '__main__':
+    n_reruns = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    t = time.perf_counter()
+    primera, rerun = medir(n_reruns)
+    total = time.perf_counter() - t
+
+    print(f"Arranque en frío (primera ejecución): {primera:.3f} s")
+    print(f"Rerun (mediana de {n_reruns}):           {rerun * 1000:.1f} ms")
+    print(f"Proceso completo:                    {total:.3f} s")
@@ -0,0 +1,114 @@
+# Fuente SQLite: lectura completa por lotes en arrays tipados frente a pandas.read_sql,
+# agregaciones resueltas en la base de datos frente a traer la tabla y agregar en memoria,
+# agregados de las páginas del dashboard (resumen, tiendas y estados) con y sin leer la tabla,
+# y consultas concurrentes con pool de conexiones frente a una conexión por consulta.
+# Uso: python benchmarks/bench_basedatos.py [n_filas]
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import basedatos
+import metricas
+from paginas.estado import agregar_estados
+from paginas.tienda import agregar_tiendas
+from _datos_sinteticos import generar_ventas
+
+
+def pico_memoria(funcion):
+    tracemalloc.start()
+    funcion()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return pico / 1024 ** 2
+
+
+def medir(funcion, repeticiones=3):
+    tiempos = []
+    for _ in range(repeticiones):
+        t = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - t)
+    return min(tiempos), resultado
+
+
+def concurrencia(fuente, n_hilos, consultas_por_hilo, con_pool):
+    ruta = fuente.ruta
+
+    def trabajo(i):
+        for j in range(consultas_por_hilo):
+            tienda = (i * consultas_por_hilo + j) % 54 + 1
+            if con_pool:
+                fuente.top_familias(5, tienda=tienda, desde='2016-01-01')
+            else:
+                directa = basedatos.FuenteSQL(basedatos.PoolConexiones(lambda: sqlite3.connect(ruta), tamano=1), ruta=ruta)
+                directa.top_familias(5, tienda=tienda, desde='2016-01-01')
+                directa.pool.cerrar()
+
+    hilos = [threading.Thread(target=trabajo, args=(i,)) for i in range(n_hilos)]
+    t = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return n_hilos * consultas_por_hilo / (time.perf_counter() - t)
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    carpeta = tempfile.mkdtemp()
+    ruta = os.path.join(carpeta, 'ventas.sqlite')
+    df = generar_ventas(n, fechas_texto=True)
+    with sqlite3.connect(ruta) as conexion:
+        df.to_sql(basedatos.TABLA_VENTAS, conexion, index=False, chunksize=basedatos.TAMANO_LOTE)
+        basedatos.crear_indices(conexion)
+    fuente = basedatos.abrir_fuente(f"sqlite:///{ruta}", tamano_pool=8)
+    print(f"Filas: {n:,} | base de datos: {os.path.getsize(ruta) / 1024 ** 2:,.0f} MB")
+
+    # Lectura completa
+    t_lotes, leido = medir(fuente.leer_ventas)
+    with sqlite3.connect(ruta) as conexion:
+        t_pandas, _ = medir(lambda: pd.read_sql(f"SELECT * FROM {basedatos.TABLA_VENTAS}", conexion))
+        pico_pandas = pico_memoria(lambda: pd.read_sql(f"SELECT * FROM {basedatos.TABLA_VENTAS}", conexion))
+    pico_lotes = pico_memoria(fuente.leer_ventas)
+    print(f"Lectura completa: lotes a arrays tipados {t_lotes:.2f} s (pico {pico_lotes:,.0f} MB) | "
+          f"pandas.read_sql {t_pandas:.2f} s (pico {pico_pandas:,.0f} MB) | "
+          f"resultado {leido.memory_usage(deep=True).sum() / 1024 ** 2:,.0f} MB")
+
+    # Consultas de la API: agregación en la base de datos frente a tabla completa + pandas
+    consultas = {
+        'top familias (tienda 7, 2016)': ('top_familias', {'n': 10, 'tienda': 7, 'desde': '2016-01-01', 'hasta': '2016-12-31'}),
+        'ventas por estado (todo)': ('ventas_por_estado', {}),
+        'promociones (estado, 2017)': ('resumen_promocion', {'estado': 'Estado 3', 'desde': '2017-01-01'}),
+        'tendencia mensual (tienda 7)': ('tendencia_mensual', {'tienda': 7}),
+    }
+    en_memoria = leido.assign(date=pd.to_datetime(leido['date']))
+    print(f"{'consulta':<32} {'en la base de datos':>20} {'tabla completa + pandas':>25} {'solo pandas':>12}")
+    for nombre, (metodo, argumentos) in consultas.items():
+        t_sql, _ = medir(lambda: getattr(fuente, metodo)(**argumentos))
+        n_top = argumentos.pop('n', None)
+        extra = (n_top,) if n_top else ()
+        t_mem, _ = medir(lambda: getattr(metricas, metodo)(metricas.filtrar(en_memoria, **argumentos), *extra))
+        print(f"{nombre:<32} {t_sql * 1000:>17.1f} ms {(t_lotes + t_mem) * 1000:>22.1f} ms {t_mem * 1000:>9.1f} ms")
+
+    # Páginas del dashboard: sidebar, Información por Tienda e Información por Estado
+    def paginas(origen):
+        return origen.resumen(), agregar_tiendas(origen), agregar_estados(origen)
+
+    t_sql, _ = medir(lambda: paginas(basedatos.OrigenCubo(fuente, fuente.cubo_mensual())))
+    t_mem, _ = medir(lambda: paginas(metricas.OrigenMemoria(en_memoria)))
+    print(f"{'agregados de las páginas':<32} {t_sql * 1000:>17.1f} ms {(t_lotes + t_mem) * 1000:>22.1f} ms {t_mem * 1000:>9.1f} ms")
+
+    # Concurrencia
+    for con_pool in (True, False):
+        qps = concurrencia(fuente, 8, 25, con_pool)
+        print(f"8 hilos, top familias por tienda, {'con pool (8 conexiones)' if con_pool else 'conexión nueva por consulta'}: "
+              f"{qps:,.0f} consultas/s")
+    fuente.pool.cerrar()
@@ -0,0 +1,94 @@
+# Prueba de resistencia de la caché con varios usuarios simultáneos
+# Cada usuario recorre páginas al azar (agregados y gráficos por tienda y estado, índice de
+# rasterizado, resumen del sidebar) y cada 10 segundos cambia la versión de los datos,
+# como si se recargaran los CSV (las entradas anteriores quedan obsoletas).
+# Se mide la memoria residente de la caché y del proceso.
+# Uso: python benchmarks/bench_cache.py [presupuesto_mb (0 = sin límite)] [usuarios] [segundos]
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import cache
+import metricas
+from datos import resumen_muestra
+from paginas import avanzado, estado, tienda
+from _datos_sinteticos import generar_ventas
+
+FAMILIAS = ['GROCERY I', 'BEVERAGES', 'PRODUCE', 'CLEANING', 'DAIRY', 'BREAD/BAKERY', 'POULTRY', 'MEATS']
+
+
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * 4096 / 1024 ** 2
+
+
+def usuario(df, versiones, fin, errores):
+    rng = random.Random(threading.get_ident())
+    origen = metricas.OrigenMemoria(df)
+    variables = list(avanzado.rasterizado.VARIABLES)
+    try:
+        while time.perf_counter() < fin:
+            version = versiones[-1]
+            resumen_muestra(origen, version)
+            pagina = rng.choice(['tienda', 'estado', 'exploracion'])
+            if pagina == 'tienda':
+                agregados = tienda.calcular_agregados(origen, version)
+                tienda.calcular_figuras(agregados, version, rng.choice(list(agregados['info'].index)))
+            elif pagina == 'estado':
+                agregados = estado.calcular_agregados(origen, version)
+                estado.calcular_figuras(agregados, version, rng.choice(list(agregados['info'].index)))
+            else:
+                x, y = rng.sample(variables, 2)
+                avanzado.indice_rasterizado(df, version, x, y, rng.random() < 0.5)
+    except Exception as e:
+        errores.append(e)
+
+
+if __name__ == '__main__':
+    presupuesto_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    n_usuarios = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    segundos = float(sys.argv[3]) if len(sys.argv) > 3 else 60.0
+
+    df = generar_ventas(500_000, familias=FAMILIAS)
+    cache.CACHE = cache.GestorCache(presupuesto_bytes=presupuesto_mb * 1024 ** 2 if presupuesto_mb else None)
+    print(f"Presupuesto: {presupuesto_mb or 'sin límite'} MB | usuarios: {n_usuarios} | {segundos:.0f} s | "
+          f"RSS inicial: {rss_mb():,.0f} MB")
+
+    versiones = [(('soak', 0),)]
+    errores = []
+    fin = time.perf_counter() + segundos
+    hilos = [threading.Thread(target=usuario, args=(df, versiones, fin, errores)) for _ in range(n_usuarios)]
+    for hilo in hilos:
+        hilo.start()
+
+    # Nueva versión de los datos cada 10 s; muestreo de memoria cada segundo
+    inicio = time.perf_counter()
+    pico_cache = pico_rss = 0.0
+    siguiente_version = inicio + 10
+    print(f"{'t (s)':>6} {'versión':>8} {'caché (MB)':>11} {'entradas':>9} {'RSS (MB)':>9} {'aciertos':>9} {'LRU':>6} {'TTL':>5}")
+    while any(hilo.is_alive() for hilo in hilos):
+        time.sleep(1)
+        ahora = time.perf_counter()
+        if ahora >= siguiente_version:
+            versiones.append((('soak', len(versiones)),))
+            siguiente_version += 10
+        e = cache.CACHE.estadisticas()
+        pico_cache = max(pico_cache, e['bytes'] / 1024 ** 2)
+        pico_rss = max(pico_rss, rss_mb())
+        if int(ahora - inicio) % 5 == 0:
+            tasa = e['tasa_aciertos'] or 0
+            print(f"{ahora - inicio:>6.0f} {len(versiones):>8} {e['bytes'] / 1024 ** 2:>11,.1f} {e['entradas']:>9} "
+                  f"{rss_mb():>9,.0f} {tasa * 100:>8.1f}% {e['desalojos_lru']:>6} {e['desalojos_ttl']:>5}")
+
+    for hilo in hilos:
+        hilo.join()
+    if errores:
+        raise errores[0]
+
+    e = cache.CACHE.estadisticas()
+    print(f"Pico de la caché: {pico_cache:,.1f} MB | pico RSS: {pico_rss:,.0f} MB | "
+          f"consultas: {e['aciertos'] + e['fallos']:,} | desalojos LRU: {e['desalojos_lru']:,}")
+    print(e['por_funcion'].to_string(index=False))
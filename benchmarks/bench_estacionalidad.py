@@ -0,0 +1,69 @@
+# Perfiles de estacionalidad precalculados frente a un groupby por consulta sobre un volumen
+# similar al dataset completo (54 tiendas x 33 familias, ~3M filas, con festivos)
+# Uso: python benchmarks/bench_estacionalidad.py [n_filas]
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import estacionalidad
+from _datos_sinteticos import CIUDADES, ESTADOS, N_TIENDAS, generar_ventas
+
+
+def generar_datos(n, semilla=0):
+    df = generar_ventas(n, semilla)[['date', 'store_nbr', 'family', 'sales', 'state', 'city']]
+    # Un 8% de las filas cae en un festivo nacional, regional o local (no siempre de su tienda)
+    rng = np.random.default_rng(semilla + 1)
+    festivo = rng.random(n) < 0.08
+    locale = np.array(['National', 'Regional', 'Local'])[rng.integers(0, 3, n)]
+    df['holiday_type'] = np.where(festivo, np.array(['Holiday', 'Event', 'Additional'])[rng.integers(0, 3, n)], None)
+    df['locale'] = np.where(festivo, locale, None)
+    df['locale_name'] = np.where(
+        locale == 'Regional', ESTADOS[rng.integers(1, N_TIENDAS + 1, n)],
+        np.where(locale == 'Local', CIUDADES[rng.integers(1, N_TIENDAS + 1, n)], 'Ecuador')
+    )
+    df['transferred'] = np.where(festivo, rng.random(n) < 0.05, None)
+    return df
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return np.median(tiempos) * 1000
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 3_000_000
+    df = generar_datos(n)
+    print(f"{n:,} filas")
+
+    inicio = time.perf_counter()
+    perfiles = estacionalidad.construir_perfiles(df)
+    print(f"Construcción de los perfiles (una vez por versión de los datos): {time.perf_counter() - inicio:.2f} s")
+
+    # Consultas de las pestañas: día, semana y mes de una tienda, con y sin festivos
+    def con_groupby():
+        filas = df[df['store_nbr'] == 7]
+        filas = filas[~estacionalidad.festivos_aplicables(filas)]
+        filas.groupby(filas['date'].dt.dayofweek)['sales'].mean()
+        filas.groupby(filas['date'].dt.isocalendar().week)['sales'].mean()
+        filas.groupby(filas['date'].dt.month)['sales'].mean()
+
+    def con_perfiles():
+        for eje in ('dia', 'semana', 'mes'):
+            estacionalidad.perfil(perfiles, eje, 'tienda', 7, sin_festivos=True)
+
+    print(f"Perfil de una tienda sin festivos (3 ejes), groupby: {medir(con_groupby, 5):,.1f} ms")
+    print(f"Perfil de una tienda sin festivos (3 ejes), precalculado: {medir(con_perfiles, 50):,.2f} ms")
+
+    # Comprobación: los perfiles coinciden con el groupby
+    filas = df[(df['store_nbr'] == 7)]
+    filas = filas[~estacionalidad.festivos_aplicables(filas)]
+    esperado = filas.groupby(filas['date'].dt.dayofweek)['sales'].mean().to_numpy()
+    obtenido = estacionalidad.perfil(perfiles, 'dia', 'tienda', 7, sin_festivos=True)['sales'].to_numpy()
+    print(f"Diferencia máxima con el groupby: {np.abs(esperado - obtenido).max():.2e}")
@@ -0,0 +1,58 @@
+# Latencia del simulador de promociones sobre un volumen similar al dataset completo
+# (54 tiendas x 33 familias, ~3M filas): construcción del cubo y proyección por movimiento de slider
+# Uso: python benchmarks/bench_promociones.py [n_filas]
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import promociones
+from _datos_sinteticos import FAMILIAS, N_TIENDAS, generar_ventas
+
+
+def generar_datos(n, semilla=0):
+    # Ventas con una elasticidad conocida por familia respecto a log(1 + promociones)
+    df = generar_ventas(n, semilla)[['family', 'store_nbr', 'month']]
+    rng = np.random.default_rng(semilla + 1)
+    elasticidades = rng.uniform(0.0, 1.0, len(FAMILIAS))
+    codigo_familia = np.searchsorted(FAMILIAS, df['family'].to_numpy())
+    tiendas = df['store_nbr'].to_numpy()
+    tamano_tienda = rng.uniform(0.5, 2.0, N_TIENDAS + 1)[tiendas]
+    promocion = rng.poisson(rng.uniform(0, 4, N_TIENDAS + 1)[tiendas]) * (rng.random(n) < 0.3)
+    df['sales'] = np.expm1(
+        np.log1p(100 * tamano_tienda) + elasticidades[codigo_familia] * np.log1p(promocion) + rng.normal(0, 0.3, n)
+    )
+    df['onpromotion'] = promocion
+    return df, dict(zip(FAMILIAS, elasticidades))
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 3_000_000
+    df, reales = generar_datos(n)
+
+    t = time.perf_counter()
+    cubo = promociones.construir_cubo(df)
+    construccion = time.perf_counter() - t
+    error = np.abs(cubo['elasticidades'] - np.array([reales[f] for f in cubo['familias']])).max()
+    print(f"Filas: {n:,} | cubo {cubo['ventas'].shape} en {construccion:.2f} s | "
+          f"error máximo de la elasticidad estimada: {error:.3f}")
+
+    rng = np.random.default_rng(1)
+    tiempos = []
+    for _ in range(200):
+        t = time.perf_counter()
+        multiplicador, adicionales = promociones.intensidad(
+            cubo,
+            familias=list(rng.choice(cubo['familias'], 5, replace=False)),
+            tiendas=list(rng.choice(cubo['tiendas'], 10, replace=False)),
+            meses=list(rng.choice(np.arange(1, 13), 3, replace=False)),
+            multiplicador=rng.uniform(0, 3),
+            adicionales=rng.integers(0, 10)
+        )
+        promociones.resumen_simulacion(cubo, promociones.simular(cubo, multiplicador, adicionales))
+        tiempos.append(time.perf_counter() - t)
+    tiempos = np.array(tiempos) * 1000
+    print(f"Simulación (intensidad + proyección + resúmenes): p50 {np.percentile(tiempos, 50):.2f} ms | "
+          f"p95 {np.percentile(tiempos, 95):.2f} ms")
@@ -0,0 +1,44 @@
+# Latencia del rasterizado de una vista frente al número de filas
+# (origen de la vista y celdas o puntos leídos para calcularla)
+# Uso: python benchmarks/bench_rasterizado.py
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import rasterizado
+
+
+def medir(indice, rango_x, rango_y, repeticiones=5):
+    tiempos = []
+    for _ in range(repeticiones):
+        t = time.perf_counter()
+        _, _, _, origen, leidos = rasterizado.rasterizar_vista(indice, rango_x, rango_y, ancho=400, alto=300)
+        tiempos.append(time.perf_counter() - t)
+    return np.median(tiempos) * 1000, origen, leidos
+
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    print(f"{'filas':>12} {'preparación':>12} | {'vista completa':>37} | {'zoom 50%':>37} | {'zoom 2%':>37}")
+    for n in [100_000, 1_000_000, 5_000_000, 20_000_000]:
+        ventas = rng.gamma(1.5, 300.0, n)
+        transacciones = ventas * rng.lognormal(1.0, 0.4, n) + rng.normal(1500, 300, n)
+
+        t = time.perf_counter()
+        indice = rasterizado.construir_indice(ventas, transacciones)
+        preparacion = time.perf_counter() - t
+
+        (x0, x1), (y0, y1) = indice['extension_x'], indice['extension_y']
+        vistas = [
+            (None, None),
+            ((x0, x0 + (x1 - x0) * 0.5), (y0, y0 + (y1 - y0) * 0.5)),
+            ((x0, x0 + (x1 - x0) * 0.02), (y0, y0 + (y1 - y0) * 0.02)),
+        ]
+        columnas = []
+        for rango_x, rango_y in vistas:
+            ms, origen, leidos = medir(indice, rango_x, rango_y)
+            columnas.append(f"{ms:6.1f} ms {origen:>17} {leidos:>9,}")
+        print(f"{n:>12,} {preparacion:>10.2f} s | " + " | ".join(columnas))
@@ -0,0 +1,39 @@
+# Benchmark de la validación de ingesta sobre un volumen similar al dataset completo
+# Uso: python benchmarks/bench_validacion.py [n_filas]
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import validacion
+from _datos_sinteticos import generar_ventas
+
+
+def generar_datos(n, semilla=0):
+    # Filas con el formato de los CSV (fechas como texto) y un 0,1 % de errores inyectados
+    df = generar_ventas(n, semilla, familias=['GROCERY I'], fechas_texto=True)
+    rng = np.random.default_rng(semilla + 1)
+    malas = rng.choice(n, n // 1000, replace=False)
+    partes = np.array_split(malas, 4)
+    df.loc[partes[0], 'sales'] = -1.0
+    df.loc[partes[1], 'date'] = '2019-01-01'
+    df.loc[partes[2], 'store_nbr'] = 99
+    df.loc[partes[3], 'city'] = 'Ciudad desconocida'
+    return df
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 3_000_000
+    df = generar_datos(n)
+
+    t0 = time.perf_counter()
+    valido, cuarentena, informe = validacion.validar_ventas(df)
+    t1 = time.perf_counter()
+
+    print(f"Filas: {n:,} | válidas: {informe['validas']:,} | cuarentena: {informe['cuarentena']:,}")
+    for motivo, conteo in informe['por_motivo'].items():
+        if conteo:
+            print(f"  {motivo}: {conteo:,}")
+    print(f"Tiempo: {t1 - t0:.2f} s ({n / (t1 - t0):,.0f} filas/s)")
@@ -0,0 +1,261 @@
+# ===========================================
+# GESTOR DE CACHÉ CON PRESUPUESTO DE MEMORIA
+# ===========================================
+# Una sola caché en memoria para todo el proceso (la comparten todas las sesiones
+# del dashboard). Cada entrada guarda su tamaño estimado en bytes; si el total supera
+# el presupuesto se desalojan las entradas usadas hace más tiempo (LRU), y las que
+# tienen TTL caducan al consultarlas o al hacer sitio. Lleva contadores de aciertos,
+# fallos y desalojos para el panel del sidebar.
+#
+# Los datos base (filas limpias y cubo mensual) van en una caché aparte sin presupuesto
+# (CACHE_DATOS): así las figuras y los índices no los desalojan, y tampoco se rechazan
+# por grandes. Solo guarda el último resultado de cada función (el de la versión actual).
+#
+# El presupuesto se puede cambiar con la variable de entorno DASHBOARD_CACHE_MB.
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+
+import numpy as np
+import pandas as pd
+
+PRESUPUESTO_MB = int(os.environ.get('DASHBOARD_CACHE_MB', 1024))
+
+# Caducidad por defecto de los gráficos cacheados (segundos)
+TTL_FIGURAS = 3600
+
+_AUSENTE = object()
+
+
+# ===========================================
+# TAMAÑO DE LAS ENTRADAS
+# ===========================================
+def tamano_en_bytes(valor, _vistos=None):
+    # Estimación del tamaño en memoria de un valor cacheado. Los objetos compartidos
+    # dentro de una misma entrada se cuentan una sola vez.
+    vistos = set() if _vistos is None else _vistos
+    if id(valor) in vistos:
+        return 0
+    vistos.add(id(valor))
+
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        uso = valor.memory_usage(deep=True, index=True)
+        return int(uso.sum() if isinstance(valor, pd.DataFrame) else uso)
+    if isinstance(valor, pd.Index):
+        return int(valor.memory_usage(deep=True))
+    if isinstance(valor, np.ndarray):
+        return int(valor.nbytes)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(
+            tamano_en_bytes(k, vistos) + tamano_en_bytes(v, vistos) for k, v in valor.items()
+        )
+    if isinstance(valor, (list, tuple, set, frozenset)):
+        return sys.getsizeof(valor) + sum(tamano_en_bytes(v, vistos) for v in valor)
+    if hasattr(valor, 'to_plotly_json'):
+        # Figuras de plotly: se mide su representación (datos de las trazas y layout)
+        return tamano_en_bytes(valor.to_plotly_json(), vistos)
+    return sys.getsizeof(valor)
+
+
+# ===========================================
+# GESTOR
+# ===========================================
+class GestorCache:
+    # Caché LRU con presupuesto en bytes, límite opcional de entradas y TTL por entrada
+    def __init__(self, presupuesto_bytes=None, max_entradas=None, una_por_nombre=False):
+        self.presupuesto_bytes = presupuesto_bytes
+        self.max_entradas = max_entradas
+        # Si es True, cada entrada nueva sustituye a las anteriores de la misma función
+        self.una_por_nombre = una_por_nombre
+        # clave -> [valor, bytes, caduca (monotonic o None), nombre]
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        # Un cálculo en curso por clave: las sesiones que piden lo mismo a la vez esperan
+        self._calculando = {}
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos_lru = 0
+        self.desalojos_ttl = 0
+        self.rechazados = 0
+        self._aciertos_por_nombre = Counter()
+        self._fallos_por_nombre = Counter()
+
+    def _quitar(self, clave):
+        entrada = self._entradas.pop(clave)
+        self.bytes -= entrada[1]
+
+    def _buscar(self, clave, contar=True):
+        entrada = self._entradas.get(clave)
+        if entrada is not None and entrada[2] is not None and entrada[2] <= time.monotonic():
+            self._quitar(clave)
+            self.desalojos_ttl += 1
+            entrada = None
+        if entrada is None:
+            if contar:
+                self.fallos += 1
+                self._fallos_por_nombre[_nombre_clave(clave)] += 1
+            return _AUSENTE
+        self._entradas.move_to_end(clave)
+        if contar:
+            self.aciertos += 1
+            self._aciertos_por_nombre[entrada[3]] += 1
+        return entrada[0]
+
+    def obtener(self, clave, defecto=None):
+        with self._lock:
+            valor = self._buscar(clave)
+        return defecto if valor is _AUSENTE else valor
+
+    def guardar(self, clave, valor, ttl=None, nombre=None, tamano=None):
+        # El tamaño se mide fuera del lock (puede recorrer un DataFrame grande)
+        tamano = tamano_en_bytes(valor) if tamano is None else tamano
+        nombre = nombre or _nombre_clave(clave)
+        with self._lock:
+            if clave in self._entradas:
+                self._quitar(clave)
+            if self.una_por_nombre:
+                for anterior in [c for c, e in self._entradas.items() if e[3] == nombre]:
+                    self._quitar(anterior)
+            if self.presupuesto_bytes is not None and tamano > self.presupuesto_bytes:
+                # No cabe ni con la caché vacía: se devuelve sin guardar
+                self.rechazados += 1
+                return False
+            caduca = time.monotonic() + ttl if ttl else None
+            self._entradas[clave] = [valor, tamano, caduca, nombre]
+            self.bytes += tamano
+            self._hacer_sitio()
+            return True
+
+    def _hacer_sitio(self):
+        # Primero las entradas caducadas; después las menos usadas recientemente
+        if self._excedida():
+            ahora = time.monotonic()
+            for clave in [c for c, e in self._entradas.items() if e[2] is not None and e[2] <= ahora]:
+                self._quitar(clave)
+                self.desalojos_ttl += 1
+        while self._excedida() and len(self._entradas) > 1:
+            self._quitar(next(iter(self._entradas)))
+            self.desalojos_lru += 1
+
+    def _excedida(self):
+        return ((self.presupuesto_bytes is not None and self.bytes > self.presupuesto_bytes)
+                or (self.max_entradas is not None and len(self._entradas) > self.max_entradas))
+
+    def purgar_caducadas(self):
+        with self._lock:
+            ahora = time.monotonic()
+            for clave in [c for c, e in self._entradas.items() if e[2] is not None and e[2] <= ahora]:
+                self._quitar(clave)
+                self.desalojos_ttl += 1
+
+    def vaciar(self):
+        with self._lock:
+            self._entradas.clear()
+            self.bytes = 0
+
+    def calcular(self, clave, funcion, ttl=None, nombre=None):
+        # Devuelve el valor cacheado o lo calcula una sola vez aunque lo pidan varias sesiones
+        with self._lock:
+            valor = self._buscar(clave)
+            if valor is not _AUSENTE:
+                return valor
+            en_curso = self._calculando.setdefault(clave, threading.Lock())
+
+        try:
+            with en_curso:
+                with self._lock:
+                    valor = self._buscar(clave, contar=False)
+                if valor is _AUSENTE:
+                    valor = funcion()
+                    self.guardar(clave, valor, ttl=ttl, nombre=nombre)
+        finally:
+            # También si el cálculo falla: no se acumulan locks de claves que fallan siempre
+            with self._lock:
+                self._calculando.pop(clave, None)
+        return valor
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            por_nombre = {}
+            for entrada in self._entradas.values():
+                fila = por_nombre.setdefault(entrada[3], {'entradas': 0, 'bytes': 0})
+                fila['entradas'] += 1
+                fila['bytes'] += entrada[1]
+            nombres = set(por_nombre) | set(self._aciertos_por_nombre) | set(self._fallos_por_nombre)
+            return {
+                'entradas': len(self._entradas),
+                'bytes': self.bytes,
+                'presupuesto_bytes': self.presupuesto_bytes,
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'tasa_aciertos': self.aciertos / consultas if consultas else None,
+                'desalojos_lru': self.desalojos_lru,
+                'desalojos_ttl': self.desalojos_ttl,
+                'rechazados': self.rechazados,
+                'por_funcion': pd.DataFrame([
+                    {
+                        'funcion': nombre,
+                        'entradas': por_nombre.get(nombre, {}).get('entradas', 0),
+                        'bytes': por_nombre.get(nombre, {}).get('bytes', 0),
+                        'aciertos': self._aciertos_por_nombre[nombre],
+                        'fallos': self._fallos_por_nombre[nombre]
+                    }
+                    for nombre in sorted(nombres)
+                ], columns=['funcion', 'entradas', 'bytes', 'aciertos', 'fallos'])
+            }
+
+    def __len__(self):
+        return len(self._entradas)
+
+
+def _nombre_clave(clave):
+    # Las claves del decorador empiezan por el nombre de la función
+    return clave[0] if isinstance(clave, tuple) and clave and isinstance(clave[0], str) else 'otros'
+
+
+# Caché global del dashboard
+CACHE = GestorCache(presupuesto_bytes=PRESUPUESTO_MB * 1024 ** 2)
+
+# Datos base de la versión actual, fuera del presupuesto de CACHE
+CACHE_DATOS = GestorCache(una_por_nombre=True)
+
+
+# ===========================================
+# DECORADOR
+# ===========================================
+def _valor_clave(valor):
+    try:
+        hash(valor)
+        return valor
+    except TypeError:
+        return repr(valor)
+
+
+def memorizar(ttl=None, gestor=None):
+    # Sustituto de st.cache_data sobre el gestor global. Como en Streamlit, los
+    # argumentos que empiezan por "_" no forman parte de la clave (se pasa en su lugar
+    # la versión de los datos). El valor se devuelve sin copiar: no hay que modificarlo.
+    def decorador(funcion):
+        firma = inspect.signature(funcion)
+        nombre = f"{funcion.__module__}.{funcion.__qualname__}"
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            argumentos = firma.bind(*args, **kwargs)
+            argumentos.apply_defaults()
+            clave = (nombre,) + tuple(
+                (parametro, _valor_clave(valor))
+                for parametro, valor in argumentos.arguments.items()
+                if not parametro.startswith('_')
+            )
+            # (un gestor vacío es falso por __len__: se compara con None)
+            return (CACHE if gestor is None else gestor).calcular(clave, lambda: funcion(*args, **kwargs), ttl=ttl, nombre=nombre)
+
+        return envoltura
+    return decorador
@@ -0,0 +1,204 @@
+# ===========================================
+# CARGA DE DATOS Y VERSIÓN DE LOS DATOS
+# ===========================================
+import os
+
+import streamlit as st
+import pandas as pd
+
+import metricas
+import validacion
+from cache import CACHE_DATOS, memorizar
+
+ARCHIVOS_DATOS = ['parte_1_muestra.csv', 'parte_2_muestra.csv']
+
+# Origen de los datos: vacío para los CSV o una URL de base de datos (ver basedatos.py),
+# p. ej. DASHBOARD_FUENTE=sqlite:///data/ventas_muestra.sqlite
+URL_FUENTE = os.environ.get('DASHBOARD_FUENTE', '')
+
+_fuente = {}
+
+
+# Fuente SQL configurada (una por proceso, con su pool de conexiones) o None si se usan los CSV
+def fuente_sql():
+    if not URL_FUENTE:
+        return None
+    if 'fuente' not in _fuente:
+        import basedatos
+        _fuente['fuente'] = basedatos.abrir_fuente(URL_FUENTE)
+    return _fuente['fuente']
+
+
+# Versión de los datos: nombre, fecha de modificación y tamaño de cada archivo.
+# Sirve de clave para los cálculos cacheados, que se invalidan si cambian los CSV.
+def version_datos():
+    if URL_FUENTE:
+        try:
+            return fuente_sql().version()
+        except (OSError, ValueError):
+            # La fuente no está disponible: load_data mostrará el error al intentar leerla
+            return ((URL_FUENTE, None, None),)
+
+    version = []
+    for archivo in ARCHIVOS_DATOS:
+        try:
+            info = os.stat(archivo)
+            version.append((archivo, info.st_mtime_ns, info.st_size))
+        except FileNotFoundError:
+            version.append((archivo, None, None))
+    return tuple(version)
+
+
+# Lectura de los CSV tal cual
+def leer_csv(archivos=ARCHIVOS_DATOS):
+    # CORRECCIÓN: Agregar extensión .csv a los nombres de archivo
+    return pd.concat([pd.read_csv(archivo) for archivo in archivos], ignore_index=True)
+
+
+# Lectura, limpieza y validación de los datos (CSV o base de datos) sin depender de
+# Streamlit (la usan el dashboard, los informes por lotes y la API). Devuelve los datos
+# y la lista de avisos que el dashboard muestra en el sidebar.
+def leer_datos():
+    fuente = fuente_sql()
+    return preparar_datos(leer_csv() if fuente is None else fuente.leer_ventas())
+
+
+def preparar_datos(df):
+    avisos = []
+
+    # ELIMINAR LA COLUMNA VACÍA "Unnamed: 0" si existe
+    if 'Unnamed: 0' in df.columns:
+        df = df.drop(columns=['Unnamed: 0'])
+    
+    # Limpiar nombres de columnas (convertir a minúsculas y quitar espacios)
+    df.columns = df.columns.str.strip().str.lower()
+
+    # Verificar si la columna 'date' existe
+    if 'date' not in df.columns:
+        # Buscar columnas similares
+        date_cols = [col for col in df.columns if 'date' in col.lower() or 'fecha' in col.lower()]
+        if date_cols:
+            # Usar la primera columna que parezca ser de fecha
+            df.rename(columns={date_cols[0]: 'date'}, inplace=True)
+        else:
+            return pd.DataFrame(), avisos
+
+    # Advertir de las columnas numéricas que faltan
+    for col in ['sales', 'onpromotion', 'transactions', 'dcoilwtico']:
+        if col not in df.columns:
+            avisos.append(f"Advertencia: La columna '{col}' no existe en los datos")
+
+    # Validar tipos, rangos y coherencia tienda -> ciudad/estado/tipo en una sola pasada.
+    # Las filas inválidas se apartan a un archivo de cuarentena con sus motivos.
+    df, cuarentena, informe = validacion.validar_ventas(df)
+    if informe['cuarentena'] > 0:
+        ruta = validacion.guardar_cuarentena(cuarentena, informe)
+        motivos = ", ".join(f"{motivo}: {n}" for motivo, n in informe['por_motivo'].items() if n > 0)
+        avisos.append(f"⚠️ {informe['cuarentena']:,} registros en cuarentena ({motivos}). Ver `{ruta}`")
+    
+    # Crear columnas de fecha si no existen
+    if 'year' not in df.columns:
+        df['year'] = df['date'].dt.year
+    if 'month' not in df.columns:
+        df['month'] = df['date'].dt.month
+    if 'week' not in df.columns:
+        df['week'] = df['date'].dt.isocalendar().week
+    if 'quarter' not in df.columns:
+        df['quarter'] = df['date'].dt.quarter
+    if 'day_of_week' not in df.columns:
+        df['day_of_week'] = df['date'].dt.day_name()
+
+    return df, avisos
+
+
+# Lectura cacheada una vez por versión de los datos (compartida por todas las sesiones),
+# en la caché de datos base: no compite con las figuras por el presupuesto
+@memorizar(gestor=CACHE_DATOS)
+def leer_datos_en_cache(version):
+    return leer_datos()
+
+
+# Función para cargar los datos
+def load_data(version):
+    try:
+        df, avisos = leer_datos_en_cache(version)
+        for aviso in avisos:
+            st.sidebar.warning(aviso)
+        if df.empty:
+            return df
+
+        st.sidebar.success(f"✅ Datos cargados exitosamente: {len(df)} registros")
+        return df
+
+    except FileNotFoundError as e:
+        st.error(f"❌ Archivo no encontrado: {e}")
+        if URL_FUENTE:
+            return pd.DataFrame()
+        st.info("""
+        **Solución de problemas:**
+        1. Verifica que los archivos estén en la misma carpeta
+        2. Los nombres deben ser exactamente:
+           - parte_1_muestra.csv
+           - parte_2_muestra.csv
+        3. Asegúrate de que tengan extensión .csv
+        """)
+        return pd.DataFrame()
+    except Exception as e:
+        st.error(f"Error al cargar los datos: {e}")
+        import traceback
+        st.error(traceback.format_exc())
+        return pd.DataFrame()
+
+
+# Cubo mensual de la base de datos (tienda x familia x mes), una consulta por versión de los datos
+@memorizar(gestor=CACHE_DATOS)
+def cubo_mensual(_fuente, version):
+    return _fuente.cubo_mensual()
+
+
+# Origen de los datos de las páginas. Con los CSV son los datos cargados en memoria; con
+# DASHBOARD_FUENTE es el cubo mensual de la base de datos, sobre el que se resuelven las
+# agregaciones de las páginas sin leer la tabla entera (las filas solo se leen en los
+# análisis que las necesitan). Devuelve None si no hay datos.
+def cargar_origen(version):
+    if not URL_FUENTE:
+        df = load_data(version)
+        return None if df.empty else metricas.OrigenMemoria(df)
+
+    try:
+        import basedatos
+        fuente = fuente_sql()
+        origen = basedatos.OrigenCubo(fuente, cubo_mensual(fuente, version))
+        registros = resumen_muestra(origen, version)['registros']
+    except Exception as e:
+        st.error(f"Error al conectar con la base de datos {URL_FUENTE}: {e}")
+        return None
+    if registros == 0:
+        return None
+
+    st.sidebar.success(f"✅ Conectado a la base de datos: {registros:,} registros")
+    return origen
+
+
+# Filas completas para los análisis registro a registro (se leen de la base de datos solo
+# al abrir una página que las necesita)
+def filas(origen, version):
+    if isinstance(origen, metricas.OrigenMemoria):
+        return origen.df
+    return load_data(version)
+
+
+# Perfiles de estacionalidad (global, por tienda, estado y familia), una vez por versión de los datos.
+# En una base de datos se agregan antes las ventas por día y tienda (sin nivel de familia).
+@memorizar()
+def perfiles_estacionalidad(_origen, version):
+    import estacionalidad
+    if isinstance(_origen, metricas.OrigenMemoria):
+        return estacionalidad.construir_perfiles(_origen.df)
+    return estacionalidad.construir_perfiles(estacionalidad.ventas_diarias(_origen))
+
+
+# Estadísticas de la muestra para el sidebar, calculadas una vez por versión de los datos
+@memorizar()
+def resumen_muestra(_origen, version):
+    return _origen.resumen()
@@ -0,0 +1,198 @@
+# Perfiles de estacionalidad precalculados (día de la semana x semana ISO x mes) por tienda,
+# estado y familia, separando los días festivos que aplican a cada fila
+#
+# Con una sola pasada sobre los datos se acumulan suma de ventas y número de registros en
+# un cubo [entidad, festivo, día, semana, mes] para cada nivel. Cualquier perfil (por día,
+# semana o mes, con o sin festivos, de cualquier tienda, estado o familia) sale de sumar
+# ejes de ese cubo, sin volver a recorrer las filas.
+#
+# Un festivo aplica a una fila si es nacional, regional del estado de la tienda o local de
+# su ciudad, no se trasladó a otra fecha y no es un día laborable recuperable ("Work Day").
+#
+# También acepta ventas ya agregadas por día y tienda (columna 'registros' con el número de
+# filas de cada grupo), como las que devuelve ventas_diarias desde una base de datos.
+import numpy as np
+import pandas as pd
+
+DIAS = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
+MESES = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
+         'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
+N_SEMANAS = 53
+
+DIA_NORMAL = 'Día normal'
+TIPOS_FESTIVO = {
+    'Holiday': 'Festivo',
+    'Additional': 'Festivo adicional',
+    'Event': 'Evento',
+    'Transfer': 'Festivo trasladado',
+    'Bridge': 'Puente'
+}
+
+# Valores de 'transferred' que indican un festivo trasladado: booleano en los CSV, 0/1 en
+# bases de datos sin tipo booleano o texto
+TRASLADADO = {'true', '1', '1.0'}
+
+NIVELES = {'tienda': 'store_nbr', 'estado': 'state', 'familia': 'family'}
+
+# Ejes del cubo de cada nivel: (entidad, festivo, día, semana, mes)
+EJES = {'dia': 2, 'semana': 3, 'mes': 4}
+
+# Claves de la agregación diaria por tienda: todo lo que usan los perfiles salvo la familia
+# (empiezan por columnas que no encabezan ningún índice, como basedatos.CLAVES_CUBO)
+COLUMNAS_DIARIAS = ['holiday_type', 'locale', 'locale_name', 'transferred', 'city', 'state', 'store_nbr', 'date']
+
+
+def festivos_aplicables(df):
+    # Máscara de filas cuyo festivo aplica a la tienda de la fila
+    if 'holiday_type' not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    # Las comparaciones se hacen sobre las Series (sin convertir los textos a objetos de Python)
+    tipo = df['holiday_type']
+    aplica = tipo.notna() & tipo.ne('Work Day')
+    if 'transferred' in df.columns:
+        # Booleano, entero o texto según el origen de los datos: se interpreta una vez por valor distinto
+        codigos, valores = pd.factorize(df['transferred'])
+        trasladado = np.array([str(valor).strip().lower() in TRASLADADO for valor in valores] + [False])
+        aplica &= ~trasladado[codigos]
+    if 'locale' in df.columns and 'locale_name' in df.columns:
+        locale = df['locale']
+        local = locale.eq('Local')
+        regional = locale.eq('Regional')
+        if 'city' in df.columns:
+            local &= df['locale_name'].eq(df['city'])
+        if 'state' in df.columns:
+            regional &= df['locale_name'].eq(df['state'])
+        aplica &= locale.eq('National') | local | regional
+    return aplica.fillna(False).to_numpy(dtype=bool)
+
+
+def _calendario(fechas):
+    # Día de la semana (0 = lunes), semana ISO y mes de cada fila, calculados una vez por fecha distinta
+    codigos, unicas = pd.factorize(fechas)
+    unicas = pd.DatetimeIndex(unicas)
+    dia = unicas.dayofweek.to_numpy()[codigos]
+    semana = unicas.isocalendar().week.to_numpy(dtype=np.int64)[codigos]
+    mes = unicas.month.to_numpy()[codigos]
+    return dia, semana, mes
+
+
+def ventas_diarias(origen):
+    # Suma de ventas y número de registros por día y tienda (con sus datos de festivo),
+    # agregados en el origen de los datos en lugar de leer todas las filas
+    claves = [col for col in COLUMNAS_DIARIAS if col in origen.columnas]
+    diario = origen.agrupar(
+        claves, {'sales': ('sales', 'sum'), 'registros': ('sales', 'count')}, incluir_nulos=True
+    ).reset_index()
+    diario['date'] = pd.to_datetime(diario['date'], errors='coerce')
+    return diario[diario['date'].notna()].reset_index(drop=True)
+
+
+def _contar(celdas, registros, tamano):
+    # Número de registros por celda: uno por fila o los ya agregados en 'registros'
+    if registros is None:
+        return np.bincount(celdas, minlength=tamano)
+    return np.bincount(celdas, weights=registros, minlength=tamano).astype(np.int64)
+
+
+def construir_perfiles(df):
+    ventas = df['sales'].to_numpy(dtype=np.float64)
+    registros = df['registros'].to_numpy(dtype=np.float64) if 'registros' in df.columns else None
+    dia, semana, mes = _calendario(df['date'])
+    aplica = festivos_aplicables(df)
+
+    validas = np.isfinite(ventas) & (semana >= 1) & (semana <= N_SEMANAS)
+    # Celda de calendario de cada fila dentro del cubo de una entidad
+    celda_calendario = ((aplica.astype(np.int64) * 7 + dia) * N_SEMANAS + (semana - 1)) * 12 + (mes - 1)
+    tamano_entidad = 2 * 7 * N_SEMANAS * 12
+    forma = (2, 7, N_SEMANAS, 12)
+
+    # Tipo de festivo de cada fila (0 = día normal o festivo que no aplica a la tienda)
+    if 'holiday_type' in df.columns:
+        codigos_tipo, tipos = pd.factorize(df['holiday_type'], sort=True)
+        codigos_tipo = np.where(aplica, codigos_tipo + 1, 0)
+        nombres_tipo = [DIA_NORMAL] + list(tipos)
+    else:
+        codigos_tipo, nombres_tipo = np.zeros(len(df), dtype=np.int64), [DIA_NORMAL]
+
+    perfiles = {'tipos_festivo': nombres_tipo, 'entidades': {}, 'suma': {}, 'conteo': {}, 'suma_tipo': {}, 'conteo_tipo': {}}
+    niveles = {'global': np.zeros(len(df), dtype=np.int64)}
+    entidades = {'global': np.array([None])}
+    for nivel, columna in NIVELES.items():
+        if columna in df.columns:
+            codigos, valores = pd.factorize(df[columna], sort=True)
+            niveles[nivel] = codigos
+            entidades[nivel] = np.asarray(valores)
+            validas &= codigos >= 0
+
+    for nivel, codigos in niveles.items():
+        n = len(entidades[nivel])
+        celdas = codigos[validas] * tamano_entidad + celda_calendario[validas]
+        perfiles['entidades'][nivel] = entidades[nivel]
+        perfiles['suma'][nivel] = np.bincount(celdas, weights=ventas[validas], minlength=n * tamano_entidad).reshape((n,) + forma)
+        perfiles['conteo'][nivel] = _contar(
+            celdas, None if registros is None else registros[validas], n * tamano_entidad
+        ).reshape((n,) + forma)
+
+        celdas_tipo = codigos[validas] * len(nombres_tipo) + codigos_tipo[validas]
+        perfiles['suma_tipo'][nivel] = np.bincount(
+            celdas_tipo, weights=ventas[validas], minlength=n * len(nombres_tipo)
+        ).reshape(n, len(nombres_tipo))
+        perfiles['conteo_tipo'][nivel] = _contar(
+            celdas_tipo, None if registros is None else registros[validas], n * len(nombres_tipo)
+        ).reshape(n, len(nombres_tipo))
+
+    return perfiles
+
+
+def _indice_entidad(perfiles, nivel, entidad):
+    if nivel == 'global':
+        return 0
+    posiciones = np.flatnonzero(perfiles['entidades'][nivel] == entidad)
+    if len(posiciones) == 0:
+        raise KeyError(f"No hay datos de {nivel} {entidad}")
+    return posiciones[0]
+
+
+def perfil(perfiles, eje, nivel='global', entidad=None, sin_festivos=False, mes=None):
+    # Ventas medias por día de la semana, semana ISO o mes ('dia', 'semana', 'mes') de una
+    # entidad. Con sin_festivos se excluyen los días festivos (perfil ajustado) y con mes
+    # se limita a ese mes (1-12).
+    i = _indice_entidad(perfiles, nivel, entidad)
+    suma = perfiles['suma'][nivel][i]
+    conteo = perfiles['conteo'][nivel][i]
+    if sin_festivos:
+        suma, conteo = suma[:1], conteo[:1]
+    if mes is not None:
+        suma, conteo = suma[..., mes - 1:mes], conteo[..., mes - 1:mes]
+
+    otros_ejes = tuple(e - 1 for e in EJES.values() if e != EJES[eje]) + (0,)
+    suma = suma.sum(axis=otros_ejes)
+    conteo = conteo.sum(axis=otros_ejes)
+
+    claves = {'dia': np.arange(7), 'semana': np.arange(1, N_SEMANAS + 1), 'mes': np.arange(1, 13)}[eje]
+    etiquetas = {'dia': DIAS, 'semana': [f"Semana {s}" for s in claves], 'mes': MESES}[eje]
+    tabla = pd.DataFrame({
+        eje: claves,
+        'etiqueta': etiquetas,
+        'sales': np.divide(suma, conteo, out=np.full(len(suma), np.nan), where=conteo > 0),
+        'registros': conteo
+    })
+    return tabla[tabla['registros'] > 0].reset_index(drop=True)
+
+
+def efecto_festivos(perfiles, nivel='global', entidad=None):
+    # Ventas medias por tipo de festivo frente a los días normales
+    i = _indice_entidad(perfiles, nivel, entidad)
+    suma = perfiles['suma_tipo'][nivel][i]
+    conteo = perfiles['conteo_tipo'][nivel][i]
+    tabla = pd.DataFrame({
+        'tipo': perfiles['tipos_festivo'],
+        'etiqueta': [TIPOS_FESTIVO.get(tipo, tipo) for tipo in perfiles['tipos_festivo']],
+        'sales': np.divide(suma, conteo, out=np.full(len(suma), np.nan), where=conteo > 0),
+        'registros': conteo
+    })
+    tabla = tabla[tabla['registros'] > 0].reset_index(drop=True)
+    normal = tabla.loc[tabla['tipo'] == DIA_NORMAL, 'sales']
+    base = normal.iloc[0] if len(normal) else np.nan
+    tabla['diferencia_pct'] = (tabla['sales'] / base - 1) * 100 if base and base > 0 else np.nan
+    return tabla
@@ -0,0 +1,204 @@
+# ===========================================
+# INFORMES POR LOTES (SIN INTERFAZ) PARA TODAS LAS TIENDAS Y ESTADOS
+# ===========================================
+# Genera un informe HTML (y opcionalmente PNG) por tienda y por estado con los mismos
+# gráficos que las páginas del dashboard. Los agregados se calculan una sola vez y se
+# reparten a un pool de procesos, que solo construye y escribe los gráficos. Con
+# DASHBOARD_FUENTE los agregados se resuelven en la base de datos sin leer la tabla.
+#
+# Uso: python informes.py [--salida informes] [--procesos N] [--formatos html png]
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import metricas
+from datos import fuente_sql, leer_datos
+from paginas.tienda import agregar_tiendas, figuras_tienda
+from paginas.estado import agregar_estados, figuras_estado, producto_mas_vendido
+
+PLANTILLA_HTML = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>{titulo}</title>
+<script src="https://cdn.plot.ly/plotly-2.35.2.min.js"></script>
+<style>body {{ font-family: sans-serif; margin: 2em; }} .dato {{ margin: 0.3em 0; }}</style>
+</head>
+<body>
+<h1>{titulo}</h1>
+{datos}
+{graficos}
+<p><em>Generado el {fecha}. Nota: los análisis se basan en una muestra de datos.</em></p>
+</body>
+</html>
+"""
+
+# Estado de cada proceso del pool (se inicializa una vez por proceso, no por informe)
+_agregados = {}
+_opciones = {}
+
+
+def _inicializar_proceso(agregados_tiendas, agregados_estados, salida, formatos):
+    _agregados['tienda'] = agregados_tiendas
+    _agregados['estado'] = agregados_estados
+    _opciones['salida'] = Path(salida)
+    _opciones['formatos'] = formatos
+
+
+def _nombre_archivo(texto):
+    return re.sub(r'[^0-9A-Za-z_-]+', '_', str(texto)).strip('_')
+
+
+def _datos_entidad(tipo, clave):
+    # Métricas de cabecera del informe, las mismas que muestra la página
+    info = _agregados[tipo]['info'].loc[clave]
+    if tipo == 'tienda':
+        return {
+            'Estado': info.get('state', "N/A"),
+            'Ciudad': info.get('city', "N/A"),
+            'Tipo de Tienda': info.get('store_type', "N/A")
+        }
+
+    datos = {
+        'Número de Tiendas': int(info.get('tiendas', 0)),
+        'Número de Ciudades': int(info.get('ciudades', 0)),
+        'Ventas Totales': f"${info.get('ventas', 0):,.2f}"
+    }
+    producto_top = producto_mas_vendido(_agregados['estado'], clave)
+    if producto_top is not None:
+        datos['Producto Más Vendido'] = f"{producto_top[0]} (${producto_top[1]:,.2f})"
+    return datos
+
+
+def generar_informe(tarea):
+    tipo, clave = tarea
+    if tipo == 'tienda':
+        titulo = f"Tienda {clave}"
+        figuras = figuras_tienda(_agregados['tienda'], clave)
+    else:
+        titulo = f"Estado: {clave}"
+        figuras = figuras_estado(_agregados['estado'], clave)
+
+    carpeta = _opciones['salida'] / f"{tipo}s"
+    carpeta.mkdir(parents=True, exist_ok=True)
+    base = f"{tipo}_{_nombre_archivo(clave)}"
+    archivos = []
+
+    if 'html' in _opciones['formatos']:
+        datos = '\n'.join(f'<p class="dato"><strong>{k}:</strong> {v}</p>' for k, v in _datos_entidad(tipo, clave).items())
+        graficos = '\n'.join(fig.to_html(full_html=False, include_plotlyjs=False) for fig in figuras.values())
+        ruta = carpeta / f"{base}.html"
+        ruta.write_text(
+            PLANTILLA_HTML.format(titulo=titulo, datos=datos, graficos=graficos, fecha=time.strftime('%Y-%m-%d %H:%M')),
+            encoding='utf-8'
+        )
+        archivos.append(str(ruta))
+
+    if 'png' in _opciones['formatos']:
+        for nombre, fig in figuras.items():
+            ruta = carpeta / f"{base}_{nombre}.png"
+            fig.write_image(ruta)
+            archivos.append(str(ruta))
+
+    return tipo, clave, archivos
+
+
+def _escribir_indice(salida, resultados):
+    enlaces = []
+    for tipo, clave, archivos in resultados:
+        html = [a for a in archivos if a.endswith('.html')]
+        if html:
+            enlaces.append(f'<li><a href="{Path(html[0]).relative_to(salida).as_posix()}">{tipo.capitalize()} {clave}</a></li>')
+    indice = Path(salida) / 'index.html'
+    indice.write_text(
+        PLANTILLA_HTML.format(titulo="Informes de Ventas", datos='', graficos='<ul>\n' + '\n'.join(enlaces) + '\n</ul>',
+                              fecha=time.strftime('%Y-%m-%d %H:%M')),
+        encoding='utf-8'
+    )
+    return indice
+
+
+def generar_informes(salida='informes', procesos=None, formatos=('html',), tiendas=True, estados=True):
+    tiempos = {}
+    inicio = time.perf_counter()
+
+    if 'png' in formatos:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            print("⚠️ Exportar PNG requiere el paquete 'kaleido' (pip install kaleido); se omiten los PNG.")
+            formatos = tuple(f for f in formatos if f != 'png')
+
+    t = time.perf_counter()
+    fuente = fuente_sql()
+    if fuente is None:
+        df, avisos = leer_datos()
+        for aviso in avisos:
+            print(aviso)
+        origen = metricas.OrigenMemoria(df)
+    else:
+        import basedatos
+        origen = basedatos.OrigenCubo(fuente, fuente.cubo_mensual())
+    if origen.resumen()['registros'] == 0:
+        raise RuntimeError("No se pudieron cargar los datos. Por favor, verifica los archivos CSV.")
+    tiempos['carga'] = time.perf_counter() - t
+
+    # Agregados compartidos: se calculan una vez para todas las entidades
+    t = time.perf_counter()
+    agregados_tiendas = agregar_tiendas(origen) if tiendas and 'store_nbr' in origen.columnas else None
+    agregados_estados = agregar_estados(origen) if estados and 'state' in origen.columnas else None
+    tiempos['agregados'] = time.perf_counter() - t
+
+    tareas = []
+    if agregados_tiendas is not None:
+        tareas += [('tienda', clave) for clave in agregados_tiendas['info'].index]
+    if agregados_estados is not None:
+        tareas += [('estado', clave) for clave in agregados_estados['info'].index]
+
+    t = time.perf_counter()
+    procesos = procesos or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=procesos,
+        initializer=_inicializar_proceso,
+        initargs=(agregados_tiendas, agregados_estados, salida, formatos)
+    ) as pool:
+        resultados = list(pool.map(generar_informe, tareas, chunksize=max(1, len(tareas) // (procesos * 4))))
+    tiempos['informes'] = time.perf_counter() - t
+
+    if 'html' in formatos:
+        _escribir_indice(salida, resultados)
+    tiempos['total'] = time.perf_counter() - inicio
+
+    return resultados, tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera informes estáticos por tienda y por estado.")
+    parser.add_argument('--salida', default='informes', help="Carpeta de salida (por defecto: informes)")
+    parser.add_argument('--procesos', type=int, default=None, help="Número de procesos (por defecto: núcleos disponibles)")
+    parser.add_argument('--formatos', nargs='+', choices=['html', 'png'], default=['html'], help="Formatos de salida")
+    parser.add_argument('--solo-tiendas', action='store_true', help="Generar solo los informes de tiendas")
+    parser.add_argument('--solo-estados', action='store_true', help="Generar solo los informes de estados")
+    args = parser.parse_args()
+
+    resultados, tiempos = generar_informes(
+        salida=args.salida,
+        procesos=args.procesos,
+        formatos=tuple(args.formatos),
+        tiendas=not args.solo_estados,
+        estados=not args.solo_tiendas
+    )
+
+    n_tiendas = sum(1 for tipo, _, _ in resultados if tipo == 'tienda')
+    n_estados = sum(1 for tipo, _, _ in resultados if tipo == 'estado')
+    n_archivos = sum(len(archivos) for _, _, archivos in resultados)
+    print(f"✅ {n_tiendas} informes de tienda y {n_estados} de estado ({n_archivos} archivos) en '{args.salida}'")
+    print(f"Carga: {tiempos['carga']:.2f} s | Agregados: {tiempos['agregados']:.2f} s | "
+          f"Informes: {tiempos['informes']:.2f} s | Total: {tiempos['total']:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+# ===========================================
+# MÉTRICAS AGREGADAS COMPARTIDAS (DASHBOARD Y API)
+# ===========================================
+import numpy as np
+import pandas as pd
+
+
+def filtrar(df, tienda=None, estado=None, desde=None, hasta=None):
+    # Filtros opcionales por tienda, estado y rango de fechas (ambos extremos incluidos)
+    mascara = np.ones(len(df), dtype=bool)
+    if tienda is not None:
+        mascara &= (df['store_nbr'] == tienda).to_numpy()
+    if estado is not None:
+        mascara &= (df['state'] == estado).to_numpy()
+    if desde is not None:
+        mascara &= (df['date'] >= pd.Timestamp(desde)).to_numpy()
+    if hasta is not None:
+        mascara &= (df['date'] <= pd.Timestamp(hasta)).to_numpy()
+    return df if mascara.all() else df[mascara]
+
+
+def resumen(df):
+    # Registros, período, número de tiendas, estados, familias y meses, y ventas totales
+    datos = {'registros': len(df)}
+    if 'date' in df.columns and not df['date'].isna().all():
+        datos['periodo'] = (df['date'].min().date(), df['date'].max().date())
+    for clave, col in [('tiendas', 'store_nbr'), ('estados', 'state'), ('familias', 'family'), ('meses', 'month')]:
+        if col in df.columns:
+            datos[clave] = df[col].nunique()
+    if 'sales' in df.columns:
+        datos['ventas'] = df['sales'].sum()
+    return datos
+
+
+def top_familias(df, n=10):
+    ventas_por_familia = df.groupby('family')['sales'].sum().reset_index()
+    return ventas_por_familia.sort_values('sales', ascending=False).head(n)
+
+
+def ventas_por_estado(df):
+    ventas = df.groupby('state')['sales'].sum().reset_index()
+    return ventas.sort_values('sales', ascending=False)
+
+
+def resumen_promocion(df):
+    # Ventas totales, ventas con algún producto en promoción y su porcentaje (None si no hay ventas)
+    ventas_totales = df['sales'].sum()
+    ventas_promocion = df.loc[df['onpromotion'] > 0, 'sales'].sum()
+    porcentaje = (ventas_promocion / ventas_totales) * 100 if ventas_totales > 0 else None
+    return {
+        'ventas_totales': float(ventas_totales),
+        'ventas_promocion': float(ventas_promocion),
+        'porcentaje_promocion': None if porcentaje is None else float(porcentaje)
+    }
+
+
+def tendencia_mensual(df):
+    # Ventas por mes ordenadas por fecha, con la recta de tendencia lineal si hay más de un mes
+    return agregar_tendencia(df.groupby(['year', 'month'])['sales'].sum().reset_index())
+
+
+def agregar_tendencia(ventas_mensuales):
+    # Columna de fecha, orden cronológico y recta de tendencia sobre ventas ya agregadas por año y mes
+    # (la comparten el cálculo en memoria y la agregación en base de datos)
+    ventas_mensuales['fecha'] = pd.to_datetime(
+        ventas_mensuales['year'].astype(str) + '-' + ventas_mensuales['month'].astype(str) + '-01'
+    )
+    ventas_mensuales = ventas_mensuales.sort_values('fecha').reset_index(drop=True)
+
+    if len(ventas_mensuales) > 1:
+        z = np.polyfit(range(len(ventas_mensuales)), ventas_mensuales['sales'], 1)
+        p = np.poly1d(z)
+        ventas_mensuales['tendencia'] = p(range(len(ventas_mensuales)))
+
+    return ventas_mensuales
+
+
+def crecimiento_total(ventas_mensuales):
+    # Variación porcentual entre el primer y el último mes (None si no se puede calcular)
+    if len(ventas_mensuales) < 2:
+        return None
+    primer_mes = ventas_mensuales['sales'].iloc[0]
+    ultimo_mes = ventas_mensuales['sales'].iloc[-1]
+    if primer_mes <= 0:
+        return None
+    return ((ultimo_mes - primer_mes) / primer_mes) * 100
+
+
+class OrigenMemoria:
+    # Consultas de agregación del dashboard y de la API resueltas sobre el DataFrame
+    # cargado (basedatos.FuenteSQL ofrece las mismas y las resuelve en la base de datos)
+    def __init__(self, df):
+        self.df = df
+
+    @property
+    def columnas(self):
+        return list(self.df.columns)
+
+    def resumen(self):
+        return resumen(self.df)
+
+    def agrupar(self, claves, agregaciones, solo_promocion=False, incluir_nulos=False, **filtros):
+        # Agregaciones con nombre {columna_resultado: (columna, función)} por las claves,
+        # con funciones 'sum', 'mean', 'nunique', 'first', 'count' o 'size'
+        datos = filtrar(self.df, **filtros)
+        if solo_promocion:
+            datos = datos[datos['onpromotion'] > 0]
+        return datos.groupby(claves, dropna=not incluir_nulos).agg(**agregaciones)
+
+    def top_familias(self, n=10, **filtros):
+        return top_familias(filtrar(self.df, **filtros), n)
+
+    def ventas_por_estado(self, **filtros):
+        return ventas_por_estado(filtrar(self.df, **filtros))
+
+    def resumen_promocion(self, **filtros):
+        return resumen_promocion(filtrar(self.df, **filtros))
+
+    def tendencia_mensual(self, **filtros):
+        return tendencia_mensual(filtrar(self.df, **filtros))
@@ -0,0 +1,18 @@
+# ===========================================
+# REGISTRO DE PÁGINAS DEL DASHBOARD
+# ===========================================
+# Cada página vive en su propio módulo y solo se importa cuando se selecciona,
+# de modo que plotly y los módulos de análisis no se cargan hasta que hacen falta.
+import importlib
+
+PAGINAS = {
+    "🏠 Visión Global": "vision_global",
+    "🏪 Información por Tienda": "tienda",
+    "🗺️ Información por Estado": "estado",
+    "🌎 Contexto Macroeconómico": "macro",
+    "🚀 Análisis Avanzado": "avanzado",
+}
+
+
+def cargar_pagina(nombre):
+    return importlib.import_module(f"{__name__}.{PAGINAS[nombre]}")
@@ -0,0 +1,648 @@
+# ===========================================
+# PÁGINA 5: ANÁLISIS AVANZADO
+# ===========================================
+# Importación de librerías necesarias (solo se cargan al abrir esta página)
+import time
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+import anomalias
+import estacionalidad
+import metricas
+import promociones
+import rasterizado
+import similitud
+from cache import CACHE, memorizar
+from datos import filas, perfiles_estacionalidad
+
+
+# Estado de la detección de anomalías: se calcula una vez por combinación de parámetros
+# junto con la versión de los datos de la que sale. Con una versión nueva se actualiza de
+# forma incremental solo si los datos hasta el último día calculado no han cambiado (solo
+# se han añadido días posteriores); si no (filas corregidas o eliminadas, otro dataset),
+# se recalcula desde cero. Se vuelve a guardar tras cada cambio para que la caché mida
+# su tamaño real.
+def obtener_anomalias(df, version, ventana, min_obs):
+    clave = ('paginas.avanzado.obtener_anomalias', ventana, min_obs)
+    entrada = CACHE.obtener(clave)
+    
+    if entrada is not None and entrada['version'] == version:
+        return entrada['estado']
+    
+    if entrada is not None and anomalias.huella(df, entrada['estado']['fechas'][-1]) == entrada['huella']:
+        nuevos = df[df['date'] > entrada['estado']['fechas'][-1]]
+        estado = anomalias.actualizar_estado(entrada['estado'], nuevos) if len(nuevos) else entrada['estado']
+    else:
+        estado = anomalias.calcular_estado(df, ventana, min_obs)
+    
+    CACHE.guardar(clave, {'version': version, 'huella': anomalias.huella(df), 'estado': estado})
+    return estado
+
+
+# Modelo de similitud entre tiendas (matriz de características, similitudes, k-means,
+# información de cada tienda y resumen por grupo), precalculado una vez por versión de
+# los datos y número de grupos: al cambiar de tienda solo se leen filas del modelo
+@memorizar()
+def calcular_similitud(_df, version, k):
+    return similitud.construir_modelo(_df, k)
+
+
+# Cubo familia x tienda x mes con las elasticidades de promoción, una vez por versión de los datos
+@memorizar()
+def calcular_cubo_promociones(_df, version):
+    return promociones.construir_cubo(_df)
+
+
+# Índice de rasterizado (pirámide de rejillas y puntos ordenados) por par de variables
+@memorizar()
+def indice_rasterizado(_df, version, variable_x, variable_y, log):
+    return rasterizado.construir_indice(_df[variable_x].to_numpy(), _df[variable_y].to_numpy(), log=log)
+
+
+def mostrar(origen, version):
+    st.title("🚀 Análisis Avanzado")
+    st.markdown("---")
+    
+    # Los análisis de esta página trabajan registro a registro: necesitan las filas completas
+    df = filas(origen, version)
+    if df.empty:
+        st.error("No se pudieron cargar los registros para el análisis avanzado.")
+        return
+    
+    st.markdown("""
+    ### ¡Sorpresa para el CEO y el Jefe de Ventas!
+    Esta sección incluye análisis avanzados y visualizaciones innovadoras para facilitar la toma de decisiones.
+    
+    **Nota:** Estos análisis se basan en datos de muestra. Con los datos completos, los insights serían más precisos.
+    """)
+    
+    # Crear pestañas para diferentes análisis avanzados
+    tab_avanzado1, tab_avanzado2, tab_avanzado3, tab_avanzado4, tab_avanzado5, tab_avanzado6, tab_avanzado7 = st.tabs([
+        "📈 Análisis de Tendencia", 
+        "🏪 Comparativa de Tiendas", 
+        "📊 Efectividad de Promociones",
+        "💡 Insights y Recomendaciones",
+        "🚨 Anomalías",
+        "🧭 Tiendas Similares",
+        "🔬 Exploración"
+    ])
+    
+    with tab_avanzado1:
+        st.subheader("Análisis de Tendencia de Ventas")
+        
+        if 'year' in df.columns and 'month' in df.columns and 'sales' in df.columns:
+            ventas_mensuales = metricas.tendencia_mensual(df)
+            
+            if not ventas_mensuales.empty:
+                fig = px.line(
+                    ventas_mensuales, 
+                    x='fecha', 
+                    y='sales',
+                    title="Tendencia de Ventas Mensuales (Muestra)",
+                    labels={'sales': 'Ventas Totales ($)', 'fecha': 'Fecha'},
+                    markers=True
+                )
+                
+                # Añadir línea de tendencia
+                if 'tendencia' in ventas_mensuales.columns:
+                    fig.add_scatter(
+                        x=ventas_mensuales['fecha'], 
+                        y=ventas_mensuales['tendencia'], 
+                        mode='lines',
+                        name='Tendencia',
+                        line=dict(color='red', dash='dash')
+                    )
+                
+                st.plotly_chart(fig, use_container_width=True)
+                
+                # Análisis de crecimiento
+                crecimiento_total = metricas.crecimiento_total(ventas_mensuales)
+                if crecimiento_total is not None:
+                    st.metric("Crecimiento Total del Período (Muestra)", f"{crecimiento_total:.2f}%")
+    
+    with tab_avanzado2:
+        st.subheader("Comparativa de Rendimiento entre Tiendas")
+        
+        if 'store_nbr' in df.columns:
+            tiendas_unicas = sorted(df['store_nbr'].unique())
+            
+            if len(tiendas_unicas) > 0:
+                tiendas_comparar = st.multiselect(
+                    "Selecciona hasta 5 tiendas para comparar:",
+                    tiendas_unicas,
+                    default=tiendas_unicas[:min(3, len(tiendas_unicas))],
+                    max_selections=5
+                )
+                
+                if tiendas_comparar:
+                    df_comparacion = df[df['store_nbr'].isin(tiendas_comparar)]
+                    
+                    if 'year' in df_comparacion.columns and 'month' in df_comparacion.columns and 'sales' in df_comparacion.columns:
+                        ventas_mensuales_tienda = df_comparacion.groupby(['year', 'month', 'store_nbr'])['sales'].sum().reset_index()
+                        
+                        if not ventas_mensuales_tienda.empty:
+                            ventas_mensuales_tienda['fecha'] = pd.to_datetime(ventas_mensuales_tienda['year'].astype(str) + '-' + ventas_mensuales_tienda['month'].astype(str) + '-01')
+                            
+                            fig = px.line(
+                                ventas_mensuales_tienda, 
+                                x='fecha', 
+                                y='sales',
+                                color='store_nbr',
+                                title="Comparativa de Ventas Mensuales por Tienda (Muestra)",
+                                labels={'sales': 'Ventas ($)', 'fecha': 'Fecha', 'store_nbr': 'Número de Tienda'},
+                                markers=True
+                            )
+                            st.plotly_chart(fig, use_container_width=True)
+    
+    with tab_avanzado3:
+        st.subheader("Análisis de Efectividad de Promociones")
+        
+        if 'sales' in df.columns and 'onpromotion' in df.columns:
+            resumen_promocion = metricas.resumen_promocion(df)
+            ventas_totales = resumen_promocion['ventas_totales']
+            ventas_promocion = resumen_promocion['ventas_promocion']
+            porcentaje_promocion = resumen_promocion['porcentaje_promocion']
+            
+            if porcentaje_promocion is not None:
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Ventas Totales", f"${ventas_totales:,.2f}")
+                with col2:
+                    st.metric("Ventas en Promoción", f"${ventas_promocion:,.2f}")
+                with col3:
+                    st.metric("% de Ventas en Promoción", f"{porcentaje_promocion:.2f}%")
+                
+                # Análisis de qué productos se benefician más de las promociones
+                if 'family' in df.columns:
+                    st.subheader("Productos con Mayor Impacto de Promoción")
+                    
+                    ventas_familia_total = df.groupby('family')['sales'].sum().reset_index()
+                    ventas_familia_promocion = df[df['onpromotion'] > 0].groupby('family')['sales'].sum().reset_index()
+                    
+                    if not ventas_familia_total.empty and not ventas_familia_promocion.empty:
+                        ventas_familia = pd.merge(
+                            ventas_familia_total, 
+                            ventas_familia_promocion, 
+                            on='family', 
+                            suffixes=('_total', '_promocion'),
+                            how='left'
+                        ).fillna(0)
+                        
+                        if not ventas_familia.empty:
+                            ventas_familia['porcentaje_promocion'] = (ventas_familia['sales_promocion'] / ventas_familia['sales_total']) * 100
+                            
+                            # Filtrar familias con ventas significativas
+                            if ventas_familia['sales_total'].quantile(0.25) > 0:
+                                ventas_familia_significativas = ventas_familia[ventas_familia['sales_total'] > ventas_familia['sales_total'].quantile(0.25)]
+                                top_promocion = ventas_familia_significativas.sort_values('porcentaje_promocion', ascending=False).head(10)
+                                
+                                if not top_promocion.empty:
+                                    fig = px.bar(
+                                        top_promocion, 
+                                        x='family', 
+                                        y='porcentaje_promocion',
+                                        title="Top Familias con Mayor % de Ventas en Promoción (Muestra)",
+                                        labels={'porcentaje_promocion': '% de Ventas en Promoción', 'family': 'Familia de Producto'},
+                                        color='porcentaje_promocion',
+                                        color_continuous_scale='RdYlGn'
+                                    )
+                                    fig.update_layout(xaxis_tickangle=-45)
+                                    st.plotly_chart(fig, use_container_width=True)
+                
+                # Simulador: intensidad de promoción por familia, tienda y mes
+                if all(col in df.columns for col in ['family', 'store_nbr', 'month']):
+                    st.markdown("---")
+                    st.subheader("🧪 Simulador de Promociones: ¿Qué pasaría si...?")
+                    st.markdown("""
+                    Cambia la intensidad de promoción de las familias, tiendas y meses seleccionados (vacío = todos).
+                    La proyección usa la **elasticidad de las ventas respecto a los productos en promoción** estimada
+                    por familia con el histórico de cada tienda.
+                    """)
+                    
+                    cubo = calcular_cubo_promociones(df, version)
+                    
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        familias_simuladas = st.multiselect("Familias:", list(cubo['familias']), key="simulador_familias")
+                    with col2:
+                        tiendas_simuladas = st.multiselect("Tiendas:", list(cubo['tiendas']), key="simulador_tiendas")
+                    with col3:
+                        meses_simulados = st.multiselect(
+                            "Meses:", list(range(1, 13)), format_func=lambda m: promociones.MESES[m - 1], key="simulador_meses"
+                        )
+                    
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        multiplicador = st.slider(
+                            "Multiplicador de productos en promoción", min_value=0.0, max_value=3.0, value=1.5, step=0.1,
+                            help="1.0 = igual que en el histórico; 0.0 = sin promociones", key="simulador_multiplicador"
+                        )
+                    with col2:
+                        adicionales = st.slider(
+                            "Productos adicionales en promoción por día", min_value=0, max_value=20, value=0,
+                            help="Se suman tras aplicar el multiplicador (permite simular promociones donde no las hubo)",
+                            key="simulador_adicionales"
+                        )
+                    
+                    inicio = time.perf_counter()
+                    proyectadas = promociones.simular(cubo, *promociones.intensidad(
+                        cubo, familias_simuladas, tiendas_simuladas, meses_simulados, multiplicador, adicionales
+                    ))
+                    resumen = promociones.resumen_simulacion(cubo, proyectadas)
+                    duracion = (time.perf_counter() - inicio) * 1000
+                    
+                    ventas_base = cubo['ventas'].sum()
+                    ventas_proyectadas = proyectadas.sum()
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.metric("Ventas Históricas", f"${ventas_base:,.2f}")
+                    with col2:
+                        st.metric(
+                            "Ventas Proyectadas", f"${ventas_proyectadas:,.2f}",
+                            delta=f"{(ventas_proyectadas / ventas_base - 1) * 100:+.2f}%" if ventas_base > 0 else None
+                        )
+                    with col3:
+                        st.metric("Tiempo de Simulación", f"{duracion:.1f} ms")
+                    
+                    col_familia, col_mes = st.columns(2)
+                    with col_familia:
+                        por_familia = resumen['familia']
+                        por_familia['diferencia'] = por_familia['proyectadas'] - por_familia['base']
+                        por_familia = por_familia[por_familia['diferencia'].abs() > 0.005]
+                        por_familia = por_familia.reindex(por_familia['diferencia'].abs().sort_values(ascending=False).index).head(10)
+                        if not por_familia.empty:
+                            fig = px.bar(
+                                por_familia,
+                                x='family',
+                                y='diferencia',
+                                title="Variación Proyectada de Ventas por Familia (Top 10)",
+                                labels={'diferencia': 'Variación de Ventas ($)', 'family': 'Familia de Producto', 'elasticidad': 'Elasticidad',
+                                        'observaciones_promocion': 'Registros en Promoción', 'estimacion_previa': 'Elasticidad Previa'},
+                                color='elasticidad',
+                                color_continuous_scale='RdYlGn',
+                                hover_data=['base', 'proyectadas', 'elasticidad', 'observaciones_promocion', 'estimacion_previa']
+                            )
+                            fig.update_layout(xaxis_tickangle=-45)
+                            st.plotly_chart(fig, use_container_width=True)
+                        else:
+                            st.info("Con esta configuración no cambian las ventas proyectadas.")
+                    
+                    with col_mes:
+                        por_mes = resumen['mes'].melt(
+                            id_vars='mes', value_vars=['base', 'proyectadas'], var_name='escenario', value_name='ventas'
+                        )
+                        por_mes['escenario'] = por_mes['escenario'].map({'base': 'Histórico', 'proyectadas': 'Simulado'})
+                        fig = px.bar(
+                            por_mes,
+                            x='mes',
+                            y='ventas',
+                            color='escenario',
+                            barmode='group',
+                            title="Ventas por Mes: Histórico vs. Simulado",
+                            labels={'mes': 'Mes', 'ventas': 'Ventas ($)', 'escenario': 'Escenario'}
+                        )
+                        st.plotly_chart(fig, use_container_width=True)
+                    
+                    st.caption(f"Elasticidad conjunta estimada: {cubo['elasticidad_conjunta']:.3f} "
+                               f"(un 10% más de productos en promoción ≈ {(1.1 ** cubo['elasticidad_conjunta'] - 1) * 100:+.1f}% "
+                               f"en 1 + ventas). Estimación sobre la muestra: con pocos datos de promoción las elasticidades "
+                               f"por familia se acercan a la conjunta.")
+                    
+                    familias_previa = resumen['familia'].loc[resumen['familia']['estimacion_previa'], 'family']
+                    if len(familias_previa) > 0:
+                        st.warning(f"{len(familias_previa)} de {len(resumen['familia'])} familias tienen menos de "
+                                   f"{promociones.MIN_OBSERVACIONES_PROMOCION} registros en promoción: su elasticidad es sobre todo "
+                                   f"la estimación previa, no la de sus propios datos ({', '.join(familias_previa.head(5))}"
+                                   f"{', ...' if len(familias_previa) > 5 else ''}).")
+    
+    with tab_avanzado4:
+        st.subheader("💡 Insights Automáticos y Recomendaciones")
+        
+        # Generar insights automáticos
+        st.info("""
+        ### 📋 Insights Generados Automáticamente (basados en muestra):
+        """)
+        
+        # Insight 1: Día con más ventas
+        if 'date' in df.columns and 'sales' in df.columns:
+            # Perfil por día de la semana ya precalculado (el mismo de la pestaña de Estacionalidad)
+            ventas_por_dia = estacionalidad.perfil(perfiles_estacionalidad(origen, version), 'dia')
+            if not ventas_por_dia.empty:
+                dia_max = ventas_por_dia.loc[ventas_por_dia['sales'].idxmax(), 'etiqueta']
+                
+                st.success(f"1. **Optimizar inventario los {dia_max}**: Este día tiene las ventas promedio más altas.")
+        
+        # Insight 2: Producto más vendido
+        if 'family' in df.columns and 'sales' in df.columns:
+            producto_mas_vendido = metricas.top_familias(df, 1)
+            if not producto_mas_vendido.empty:
+                st.success(f"2. **Enfocar estrategias en {producto_mas_vendido['family'].iloc[0]}**: Es la familia de productos con mayores ventas totales.")
+        
+        # Insight 3: Estado con más ventas
+        if 'state' in df.columns and 'sales' in df.columns:
+            estado_mas_ventas = metricas.ventas_por_estado(df).head(1)
+            if not estado_mas_ventas.empty:
+                st.success(f"3. **Expandir presencia en {estado_mas_ventas['state'].iloc[0]}**: Es el estado con mayores ventas totales.")
+        
+        # Insight 4: Efectividad de promociones
+        if 'sales' in df.columns and 'onpromotion' in df.columns:
+            porcentaje_promocion = metricas.resumen_promocion(df)['porcentaje_promocion']
+            if porcentaje_promocion is not None:
+                if porcentaje_promocion < 20:
+                    st.warning(f"4. **Aumentar estrategias promocionales**: Solo el {porcentaje_promocion:.1f}% de las ventas provienen de promociones.")
+                else:
+                    st.success(f"4. **Mantener estrategias promocionales**: El {porcentaje_promocion:.1f}% de las ventas provienen de promociones.")
+        
+        # Insight 5: Tendencia de crecimiento
+        if 'year' in df.columns and 'month' in df.columns and 'sales' in df.columns:
+            crecimiento = metricas.crecimiento_total(metricas.tendencia_mensual(df))
+            if crecimiento is not None:
+                if crecimiento > 0:
+                    st.success(f"5. **Crecimiento positivo**: Las ventas han crecido un {crecimiento:.1f}% durante el período analizado.")
+                else:
+                    st.error(f"5. **Atención: decrecimiento**: Las ventas han disminuido un {abs(crecimiento):.1f}% durante el período analizado.")
+        
+        # Recomendación de promociones cuantificada con el simulador: efecto de un producto
+        # más en promoción por día en todas las familias y tiendas, mes a mes
+        recomendacion_promociones = "Planificar promociones estratégicamente durante los períodos de menor ventas para estimular la demanda."
+        if all(col in df.columns for col in ['family', 'store_nbr', 'month', 'sales', 'onpromotion']):
+            cubo = calcular_cubo_promociones(df, version)
+            por_mes = promociones.resumen_simulacion(cubo, promociones.simular(cubo, 1.0, 1.0))['mes']
+            por_mes = por_mes[por_mes['base'] > 0]
+            if not por_mes.empty:
+                por_mes['variacion'] = (por_mes['proyectadas'] / por_mes['base'] - 1) * 100
+                mes_bajo = por_mes.loc[por_mes['base'].idxmin()]
+                mes_efecto = por_mes.loc[por_mes['variacion'].idxmax()]
+                recomendacion_promociones = (
+                    f"El mes de menores ventas es **{mes_bajo['mes']}**; según el simulador, un producto más en promoción por día "
+                    f"en todas las familias y tiendas ese mes aportaría un {mes_bajo['variacion']:+.1f}% "
+                    f"(${mes_bajo['proyectadas'] - mes_bajo['base']:,.0f})"
+                )
+                if mes_efecto['month'] == mes_bajo['month']:
+                    recomendacion_promociones += ", el mayor efecto relativo de todo el año."
+                else:
+                    recomendacion_promociones += (
+                        f". El mayor efecto relativo se daría en **{mes_efecto['mes']}** ({mes_efecto['variacion']:+.1f}%)."
+                    )
+        
+        # Recomendaciones estratégicas
+        st.info(f"""
+        ### 🎯 Recomendaciones Estratégicas:
+        
+        1. **Personalización por región**: Desarrollar estrategias específicas para cada estado basadas en sus patrones de ventas únicos.
+        
+        2. **Optimización de inventario**: Usar los patrones de estacionalidad para optimizar los niveles de inventario y reducir costos.
+        
+        3. **Programación de promociones**: {recomendacion_promociones}
+        
+        4. **Benchmarking entre tiendas**: Identificar las mejores prácticas de las tiendas de alto rendimiento y replicarlas en otras ubicaciones.
+        
+        5. **Segmentación de clientes**: Utilizar los datos de transacciones para segmentar clientes y desarrollar programas de fidelización personalizados.
+        """)
+    
+    with tab_avanzado5:
+        st.subheader("🚨 Detección de Anomalías por Tienda y Familia")
+        st.markdown("""
+        Se calcula un **z-score robusto** para cada día de cada serie tienda × familia, comparando las ventas
+        con la mediana y la MAD de los días anteriores. Las alertas se ordenan por la magnitud de la desviación.
+        """)
+        
+        if 'date' in df.columns and 'store_nbr' in df.columns and 'family' in df.columns and 'sales' in df.columns:
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                ventana = st.slider("Ventana (días)", min_value=7, max_value=90, value=28, step=7)
+            with col2:
+                min_obs = st.slider("Mínimo de observaciones", min_value=2, max_value=min(30, ventana), value=7)
+            with col3:
+                umbral = st.slider("Umbral |z|", min_value=2.0, max_value=6.0, value=3.5, step=0.5)
+            with col4:
+                tipo_alerta = st.radio("Tipo de alerta", ["Todas", "Caídas", "Picos"], horizontal=True)
+            
+            estado = obtener_anomalias(df, version, ventana, min_obs)
+            alertas = anomalias.ranking_alertas(estado, umbral, tipo_alerta)
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Series Analizadas", f"{len(estado['series']):,}")
+            with col2:
+                st.metric("Días Analizados", f"{len(estado['fechas']):,}")
+            with col3:
+                st.metric("Alertas Detectadas", f"{len(alertas):,}")
+            
+            if not alertas.empty:
+                st.dataframe(
+                    alertas.head(200),
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        'date': st.column_config.DateColumn("Fecha"),
+                        'store_nbr': "Tienda",
+                        'family': "Familia",
+                        'sales': st.column_config.NumberColumn("Ventas ($)", format="%.2f"),
+                        'esperado': st.column_config.NumberColumn("Esperado ($)", format="%.2f"),
+                        'z': st.column_config.NumberColumn("z", format="%.2f"),
+                        'desviacion': st.column_config.NumberColumn("Desviación ($)", format="%.2f"),
+                        'tipo': "Tipo"
+                    }
+                )
+                
+                # Detalle de la serie de una alerta
+                top_alertas = alertas.head(50).reset_index(drop=True)
+                alerta_idx = st.selectbox(
+                    "Ver detalle de la alerta:",
+                    top_alertas.index,
+                    format_func=lambda i: f"Tienda {top_alertas.loc[i, 'store_nbr']} - {top_alertas.loc[i, 'family']} ({top_alertas.loc[i, 'date'].date()})"
+                )
+                alerta = top_alertas.loc[alerta_idx]
+                columna = estado['series'].get_loc((alerta['store_nbr'], alerta['family']))
+                
+                serie = pd.DataFrame({
+                    'fecha': estado['fechas'],
+                    'sales': estado['matriz'][:, columna],
+                    'esperado': estado['base'][:, columna]
+                }).dropna(subset=['sales'])
+                
+                fig = px.line(
+                    serie,
+                    x='fecha',
+                    y=['sales', 'esperado'],
+                    title=f"Ventas Diarias - Tienda {alerta['store_nbr']} - {alerta['family']}",
+                    labels={'value': 'Ventas ($)', 'fecha': 'Fecha', 'variable': 'Serie'},
+                    markers=True
+                )
+                fig.add_vline(x=alerta['date'], line_dash="dash", line_color="red")
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("No se detectaron anomalías con los parámetros seleccionados. En la muestra las series diarias son muy dispersas: prueba a reducir el mínimo de observaciones.")
+
+    with tab_avanzado6:
+        st.subheader("🧭 Tiendas Similares y Agrupamiento")
+        st.markdown("""
+        Cada tienda se describe por su **mezcla de familias**, su **perfil semanal de ventas**, su **% de ventas en promoción**
+        y sus **transacciones medias**. Con esa matriz se calcula la similitud coseno entre todas las tiendas y un agrupamiento k-means.
+        """)
+        
+        columnas_necesarias = ['store_nbr', 'family', 'day_of_week', 'sales', 'onpromotion', 'transactions',
+                               'city', 'state', 'store_type', 'cluster']
+        if all(col in df.columns for col in columnas_necesarias):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                num_grupos = st.slider("Número de grupos (k-means)", min_value=2, max_value=10, value=5)
+            
+            modelo = calcular_similitud(df, version, num_grupos)
+            info_tiendas = modelo['info']
+            
+            with col2:
+                tienda_referencia = st.selectbox("Tienda de referencia:", modelo['tiendas'], key="selector_tienda_similar")
+            with col3:
+                num_vecinos = st.slider("Número de tiendas similares", min_value=1, max_value=15, value=5)
+            
+            # Tiendas más similares a la seleccionada
+            similares = similitud.tiendas_similares(modelo, tienda_referencia, num_vecinos)
+            similares = similares.join(info_tiendas, on='store_nbr')
+            similares['similitud'] = similares['similitud'] * 100
+            
+            col_tabla, col_grafico = st.columns(2)
+            with col_tabla:
+                st.markdown(f"**Tiendas más similares a la Tienda {tienda_referencia}** "
+                            f"(tipo {info_tiendas.loc[tienda_referencia, 'store_type']}, cluster {info_tiendas.loc[tienda_referencia, 'cluster']})")
+                st.dataframe(
+                    similares,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        'store_nbr': "Tienda",
+                        'similitud': st.column_config.NumberColumn("Similitud (%)", format="%.1f"),
+                        'grupo_kmeans': "Grupo k-means",
+                        'city': "Ciudad",
+                        'state': "Estado",
+                        'store_type': "Tipo",
+                        'cluster': "Cluster"
+                    }
+                )
+            
+            with col_grafico:
+                fig = px.bar(
+                    similares,
+                    x=similares['store_nbr'].astype(str),
+                    y='similitud',
+                    title=f"Similitud con la Tienda {tienda_referencia}",
+                    labels={'x': 'Número de Tienda', 'similitud': 'Similitud (%)'},
+                    color='similitud',
+                    color_continuous_scale='Teal'
+                )
+                st.plotly_chart(fig, use_container_width=True)
+            
+            st.markdown("---")
+            
+            # Mapa de tiendas por grupo k-means (proyección en componentes principales)
+            mapa = pd.DataFrame({
+                'store_nbr': modelo['tiendas'],
+                'componente_1': modelo['proyeccion'][:, 0],
+                'componente_2': modelo['proyeccion'][:, 1],
+                'grupo_kmeans': modelo['etiquetas'].astype(str)
+            }).join(info_tiendas, on='store_nbr')
+            
+            fig = px.scatter(
+                mapa,
+                x='componente_1',
+                y='componente_2',
+                color='grupo_kmeans',
+                symbol='store_type',
+                hover_data=['store_nbr', 'city', 'state', 'cluster'],
+                title="Tiendas por Grupo k-means (Proyección en Componentes Principales)",
+                labels={'componente_1': 'Componente 1', 'componente_2': 'Componente 2', 'grupo_kmeans': 'Grupo', 'store_type': 'Tipo'}
+            )
+            fig.update_traces(marker=dict(size=12))
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Agregados por grupo
+            st.subheader("Resumen por Grupo")
+            resumen_grupos = modelo['grupos']
+            st.dataframe(
+                resumen_grupos,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    'grupo_kmeans': "Grupo k-means",
+                    'tiendas': "Tiendas",
+                    'ventas_medias': st.column_config.NumberColumn("Ventas Medias por Tienda ($)", format="%.2f"),
+                    'tipos': "Tipos de Tienda",
+                    'clusters': "Clusters Originales",
+                    'porcentaje_promocion': st.column_config.NumberColumn("% Ventas en Promoción", format="%.2f")
+                }
+            )
+        else:
+            st.info("Faltan columnas necesarias para calcular la similitud entre tiendas.")
+
+    with tab_avanzado7:
+        st.subheader("🔬 Exploración de Densidad")
+        st.markdown("""
+        Diagrama de dispersión de **todas las filas** convertido en un mapa de densidad en el servidor:
+        solo se envía al navegador la imagen agregada, no los puntos. Al acotar los rangos
+        se vuelve a agrupar únicamente la zona visible con más detalle.
+        """)
+
+        variables = [col for col in rasterizado.VARIABLES if col in df.columns]
+        if len(variables) >= 2:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                variable_x = st.selectbox("Eje X:", variables, index=0, format_func=rasterizado.VARIABLES.get, key="rasterizado_x")
+            with col2:
+                variable_y = st.selectbox("Eje Y:", variables, index=1, format_func=rasterizado.VARIABLES.get, key="rasterizado_y")
+            with col3:
+                escala_log = st.checkbox("Escala logarítmica en los ejes", value=True, key="rasterizado_log")
+                color_log = st.checkbox("Escala logarítmica en el color", value=True, key="rasterizado_color_log")
+
+            indice = indice_rasterizado(df, version, variable_x, variable_y, escala_log)
+            (x0, x1), (y0, y1) = indice['extension_x'], indice['extension_y']
+
+            # Zoom: los rangos se eligen con deslizadores (están en el espacio log1p si se activa)
+            col_rango_x, col_rango_y = st.columns(2)
+            with col_rango_x:
+                rango_x = st.slider("Rango visible en X", min_value=x0, max_value=x1, value=(x0, x1), key=f"rango_x_{variable_x}_{escala_log}")
+            with col_rango_y:
+                rango_y = st.slider("Rango visible en Y", min_value=y0, max_value=y1, value=(y0, y1), key=f"rango_y_{variable_y}_{escala_log}")
+
+            if rango_x[1] > rango_x[0] and rango_y[1] > rango_y[0]:
+                inicio = time.perf_counter()
+                conteos, centros_x, centros_y, origen_vista, leidos = rasterizado.rasterizar_vista(indice, rango_x, rango_y)
+                duracion = (time.perf_counter() - inicio) * 1000
+
+                col_m1, col_m2, col_m3 = st.columns(3)
+                with col_m1:
+                    st.metric("Filas en la Vista", f"{int(round(conteos.sum())):,}")
+                with col_m2:
+                    st.metric("Tiempo de Rasterizado", f"{duracion:.1f} ms")
+                with col_m3:
+                    st.metric("Origen", origen_vista)
+
+                # Píxeles vacíos transparentes; el color en log evita que las zonas densas lo saturen
+                valores = np.where(conteos > 0, np.log10(np.maximum(conteos, 1)) + 1 if color_log else conteos, np.nan)
+                prefijo = "log(1 + " if escala_log else ""
+                sufijo = ")" if escala_log else ""
+                fig = go.Figure(go.Heatmap(
+                    x=centros_x,
+                    y=centros_y,
+                    z=valores,
+                    customdata=conteos,
+                    colorscale='Viridis',
+                    colorbar={'title': "log10(filas) + 1" if color_log else "Filas"},
+                    hovertemplate="x: %{x:.2f}<br>y: %{y:.2f}<br>Filas: %{customdata:,.0f}<extra></extra>"
+                ))
+                fig.update_layout(
+                    title=f"Densidad de {rasterizado.VARIABLES[variable_y]} frente a {rasterizado.VARIABLES[variable_x]}",
+                    xaxis_title=prefijo + rasterizado.VARIABLES[variable_x] + sufijo,
+                    yaxis_title=prefijo + rasterizado.VARIABLES[variable_y] + sufijo,
+                    height=550
+                )
+                st.plotly_chart(fig, use_container_width=True)
+                st.caption(f"{leidos:,} celdas o puntos leídos para esta vista de {conteos.shape[1]}x{conteos.shape[0]} píxeles.")
+            else:
+                st.warning("Selecciona un rango con amplitud mayor que cero en ambos ejes.")
+        else:
+            st.info("Faltan columnas numéricas para la exploración de densidad.")
@@ -0,0 +1,212 @@
+# ===========================================
+# PÁGINA 3: INFORMACIÓN POR ESTADO
+# ===========================================
+# Importación de librerías necesarias (solo se cargan al abrir esta página)
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+from cache import TTL_FIGURAS, memorizar
+from datos import perfiles_estacionalidad
+from paginas.vision_global import mostrar_estacionalidad
+from paginas.tienda import tramo
+
+
+# Agregados de todos los estados a la vez, resueltos por el origen de los datos (en memoria
+# o en la base de datos). Los comparten la página y los informes por lotes.
+def agregar_estados(origen):
+    agregados = {}
+    columnas = origen.columnas
+
+    resumen = {}
+    if 'store_nbr' in columnas:
+        resumen['tiendas'] = ('store_nbr', 'nunique')
+    if 'city' in columnas:
+        resumen['ciudades'] = ('city', 'nunique')
+    if 'sales' in columnas:
+        resumen['ventas'] = ('sales', 'sum')
+    agregados['info'] = origen.agrupar(['state'], resumen or {'filas': ('state', 'size')})
+
+    if 'year' in columnas and 'transactions' in columnas:
+        agregados['transacciones_anio'] = origen.agrupar(['state', 'year'], {'transactions': ('transactions', 'sum')})['transactions']
+    if 'store_nbr' in columnas and 'sales' in columnas:
+        agregados['ventas_tienda'] = origen.agrupar(['state', 'store_nbr'], {'sales': ('sales', 'sum')})['sales']
+    if 'family' in columnas and 'sales' in columnas:
+        agregados['ventas_familia'] = origen.agrupar(['state', 'family'], {'sales': ('sales', 'sum')})['sales']
+    if 'year' in columnas and 'month' in columnas and 'sales' in columnas:
+        agregados['ventas_mes_anio'] = origen.agrupar(['state', 'year', 'month'], {'sales': ('sales', 'sum')})['sales']
+
+    return agregados
+
+
+# Familia de producto más vendida en el estado: (familia, ventas) o None
+def producto_mas_vendido(agregados, estado):
+    if 'ventas_familia' not in agregados:
+        return None
+    ventas_familia = tramo(agregados['ventas_familia'], estado).sort_values('sales', ascending=False).head(1)
+    if ventas_familia.empty:
+        return None
+    return ventas_familia['family'].iloc[0], ventas_familia['sales'].iloc[0]
+
+
+# Gráficos de un estado a partir de los agregados
+def figuras_estado(agregados, estado):
+    figuras = {}
+
+    if 'transacciones_anio' in agregados:
+        transacciones_por_anio_estado = tramo(agregados['transacciones_anio'], estado).sort_values('year')
+        if not transacciones_por_anio_estado.empty:
+            figuras['transacciones_anio'] = px.bar(
+                transacciones_por_anio_estado,
+                x='year',
+                y='transactions',
+                title=f"Transacciones por Año - {estado}",
+                labels={'transactions': 'Número de Transacciones', 'year': 'Año'},
+                color='transactions',
+                color_continuous_scale='Greens'
+            )
+
+    if 'ventas_tienda' in agregados:
+        ventas_por_tienda_estado = tramo(agregados['ventas_tienda'], estado)
+        ventas_por_tienda_estado = ventas_por_tienda_estado.sort_values('sales', ascending=False).head(5)
+        if not ventas_por_tienda_estado.empty:
+            figuras['top_tiendas'] = px.bar(
+                ventas_por_tienda_estado,
+                x='store_nbr',
+                y='sales',
+                title=f"Top 5 Tiendas - {estado}",
+                labels={'sales': 'Ventas Totales ($)', 'store_nbr': 'Número de Tienda'},
+                color='sales',
+                color_continuous_scale='Oranges'
+            )
+
+    producto_top = producto_mas_vendido(agregados, estado)
+    if producto_top is not None:
+        familia_top, ventas_top = producto_top
+        fig = go.Figure(go.Indicator(
+            mode="number",
+            value=ventas_top,
+            number={'prefix': "$", 'valueformat': ",.0f"},
+            title={"text": f"Ventas totales<br>{familia_top}"},
+            domain={'x': [0, 1], 'y': [0, 1]}
+        ))
+        fig.update_layout(
+            height=250,
+            paper_bgcolor="lightgray"
+        )
+        figuras['producto_top'] = fig
+
+    if 'ventas_mes_anio' in agregados:
+        ventas_mes_anio = tramo(agregados['ventas_mes_anio'], estado)
+        if not ventas_mes_anio.empty:
+            tabla_pivote = ventas_mes_anio.pivot(index='month', columns='year', values='sales')
+            if not tabla_pivote.empty:
+                figuras['mapa_calor'] = px.imshow(
+                    tabla_pivote,
+                    labels=dict(x="Año", y="Mes", color="Ventas ($)"),
+                    title=f"Ventas por Mes y Año - {estado}",
+                    aspect="auto",
+                    color_continuous_scale="YlOrRd"
+                )
+
+    return figuras
+
+
+@memorizar()
+def calcular_agregados(_origen, version):
+    return agregar_estados(_origen)
+
+
+@memorizar(ttl=TTL_FIGURAS)
+def calcular_figuras(_agregados, version, estado):
+    return figuras_estado(_agregados, estado)
+
+
+def mostrar(origen, version):
+    st.title("🗺️ Información por Estado")
+    st.markdown("---")
+
+    # Selector de estado en la página principal
+    if 'state' in origen.columnas:
+        agregados = calcular_agregados(origen, version)
+        estados_unicos = list(agregados['info'].index)
+
+        if len(estados_unicos) > 0:
+            st.subheader("Selecciona un estado para visualizar sus datos:")
+
+            estado_seleccionado = st.selectbox(
+                "Estado:",
+                estados_unicos,
+                key="selector_estado_pagina3"
+            )
+
+            if estado_seleccionado in agregados['info'].index:
+                # Mostrar información del estado
+                info_estado = agregados['info'].loc[estado_seleccionado]
+                num_tiendas_estado = info_estado.get('tiendas', 0)
+                num_ciudades_estado = info_estado.get('ciudades', 0)
+                ventas_totales_estado = info_estado.get('ventas', 0)
+
+                st.header(f"Estado: {estado_seleccionado} (Muestra)")
+
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Número de Tiendas", int(num_tiendas_estado))
+                with col2:
+                    st.metric("Número de Ciudades", int(num_ciudades_estado))
+                with col3:
+                    st.metric("Ventas Totales", f"${ventas_totales_estado:,.2f}")
+
+                st.markdown("---")
+
+                # Crear gráficos para el estado seleccionado
+                figuras = calcular_figuras(agregados, version, estado_seleccionado)
+                col_estado1, col_estado2, col_estado3 = st.columns(3)
+
+                with col_estado1:
+                    if 'transacciones_anio' in agregados:
+                        st.subheader("Transacciones por Año")
+                        if 'transacciones_anio' in figuras:
+                            st.plotly_chart(figuras['transacciones_anio'], use_container_width=True)
+
+                with col_estado2:
+                    if 'ventas_tienda' in agregados:
+                        st.subheader("Top 5 Tiendas por Ventas")
+                        if 'top_tiendas' in figuras:
+                            st.plotly_chart(figuras['top_tiendas'], use_container_width=True)
+
+                with col_estado3:
+                    if 'ventas_familia' in agregados:
+                        st.subheader("Producto Más Vendido en el Estado")
+
+                        producto_top = producto_mas_vendido(agregados, estado_seleccionado)
+                        if producto_top is not None:
+                            familia_top, ventas_top = producto_top
+
+                            # Mostrar el producto más vendido en un formato claro
+                            st.markdown(f"### 🏆 {familia_top}")
+                            st.markdown(f"**Ventas totales:** ${ventas_top:,.2f}")
+                            st.plotly_chart(figuras['producto_top'], use_container_width=True)
+                        else:
+                            st.warning("No hay datos suficientes para determinar el producto más vendido.")
+
+                # Análisis adicional: Mapa de calor de ventas por mes y año
+                if 'ventas_mes_anio' in agregados:
+                    st.subheader("Mapa de Calor de Ventas por Mes y Año")
+                    if 'mapa_calor' in figuras:
+                        st.plotly_chart(figuras['mapa_calor'], use_container_width=True)
+
+                # Estacionalidad del estado (perfiles precalculados, sin recorrer los datos)
+                if 'date' in origen.columnas and 'sales' in origen.columnas:
+                    st.subheader(f"📅 Estacionalidad - {estado_seleccionado}")
+                    mostrar_estacionalidad(
+                        perfiles_estacionalidad(origen, version), 'estado', estado_seleccionado,
+                        sufijo=f" - {estado_seleccionado}"
+                    )
+
+            else:
+                st.warning(f"No se encontraron datos para el estado {estado_seleccionado} en la muestra")
+        else:
+            st.warning("No hay datos de estados en la muestra")
+    else:
+        st.error("No se encontró la columna 'state' en los datos")
@@ -0,0 +1,123 @@
+# ===========================================
+# PÁGINA 4: CONTEXTO MACROECONÓMICO
+# ===========================================
+# Importación de librerías necesarias (solo se cargan al abrir esta página)
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+import pib
+from cache import memorizar
+
+
+# Función para cargar la tabla del PIB (se transforma a formato largo una sola vez)
+@memorizar(ttl=24 * 3600)
+def load_gdp():
+    return pib.cargar_tabla_pib()
+
+
+def mostrar(origen, version):
+    st.title("🌎 Contexto Macroeconómico")
+    st.markdown("---")
+    
+    try:
+        tabla_pib = load_gdp()
+    except FileNotFoundError as e:
+        st.error(f"❌ Archivo del PIB no encontrado: {e}")
+        st.stop()
+    
+    # ===========================================
+    # 4a. PIB DE ECUADOR FRENTE A LAS VENTAS
+    # ===========================================
+    st.subheader("PIB de Ecuador frente a las Ventas Mensuales")
+    
+    columnas = origen.columnas
+    if 'year' in columnas and 'month' in columnas and 'sales' in columnas:
+        ventas_mensuales = origen.agrupar(['year', 'month'], {'sales': ('sales', 'sum')}).reset_index()
+        pib_mensual = pib.pib_ventas_mensuales(tabla_pib, ventas_mensuales, codigo='ECU')
+        pib_mensual['fecha'] = pd.to_datetime(pib_mensual['year'].astype(str) + '-' + pib_mensual['month'].astype(str) + '-01')
+        pib_mensual = pib_mensual.sort_values('fecha')
+        
+        if not pib_mensual.empty:
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(
+                x=pib_mensual['fecha'],
+                y=pib_mensual['sales'],
+                mode='lines+markers',
+                name='Ventas Mensuales ($)',
+                line=dict(color='blue', width=3)
+            ))
+            fig.add_trace(go.Scatter(
+                x=pib_mensual['fecha'],
+                y=pib_mensual['gdp'],
+                mode='lines',
+                name='PIB Ecuador (US$)',
+                line=dict(color='red', dash='dash', shape='hv'),
+                yaxis='y2'
+            ))
+            fig.update_layout(
+                title="Ventas Mensuales (Muestra) y PIB Anual de Ecuador",
+                xaxis=dict(title='Fecha'),
+                yaxis=dict(title='Ventas Totales ($)'),
+                yaxis2=dict(title='PIB (US$ corrientes)', overlaying='y', side='right'),
+                legend=dict(orientation='h', y=-0.2)
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            
+            corr_mensual, corr_anual = pib.correlacion_pib_ventas(pib_mensual)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Correlación Mensual (Ventas vs. PIB)", "N/A" if np.isnan(corr_mensual) else f"{corr_mensual:.2f}")
+            with col2:
+                st.metric("Correlación Anual (Venta Media Mensual vs. PIB)", "N/A" if np.isnan(corr_anual) else f"{corr_anual:.2f}")
+            
+            st.caption("*El PIB es anual: cada mes se compara con el PIB de su año. La correlación anual usa la venta media mensual para no penalizar años incompletos.*")
+    
+    st.markdown("---")
+    
+    # ===========================================
+    # 4b. EXPLORADOR DEL PIB POR PAÍS
+    # ===========================================
+    st.subheader("Explorador del PIB por País")
+    
+    nombres_paises = dict(zip(tabla_pib.codigos, tabla_pib.nombres))
+    por_defecto = [codigo for codigo in ['ECU', 'COL', 'PER'] if codigo in nombres_paises]
+    
+    paises_seleccionados = st.multiselect(
+        "Selecciona países o regiones:",
+        list(nombres_paises.keys()),
+        default=por_defecto,
+        format_func=lambda codigo: f"{nombres_paises[codigo]} ({codigo})"
+    )
+    
+    anio_min = int(tabla_pib.anio.min())
+    anio_max = int(tabla_pib.anio.max())
+    rango_anios = st.slider(
+        "Rango de años:",
+        min_value=anio_min,
+        max_value=anio_max,
+        value=(2000, anio_max)
+    )
+    
+    if paises_seleccionados:
+        pib_paises = pib.seleccionar_pib(tabla_pib, paises_seleccionados, rango_anios[0], rango_anios[1])
+        
+        if not pib_paises.empty:
+            fig = px.line(
+                pib_paises,
+                x='year',
+                y='gdp',
+                color='country_name',
+                title=f"PIB (US$ corrientes) {rango_anios[0]}-{rango_anios[1]}",
+                labels={'gdp': 'PIB (US$)', 'year': 'Año', 'country_name': 'País'},
+                markers=True,
+                log_y=len(paises_seleccionados) > 1
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No hay datos del PIB para la selección en el rango de años indicado.")
+    else:
+        st.info("Selecciona al menos un país para visualizar su PIB.")
@@ -0,0 +1,201 @@
+# ===========================================
+# PÁGINA 2: INFORMACIÓN POR TIENDA
+# ===========================================
+# Importación de librerías necesarias (solo se cargan al abrir esta página)
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from cache import TTL_FIGURAS, memorizar
+from datos import perfiles_estacionalidad
+from paginas.vision_global import mostrar_estacionalidad
+
+
+# Agregados de todas las tiendas a la vez (una agrupación por gráfico en lugar de filtrar
+# los datos por tienda), resueltos por el origen de los datos (en memoria o en la base de
+# datos). Los comparten la página y los informes por lotes.
+def agregar_tiendas(origen):
+    agregados = {}
+    columnas = origen.columnas
+
+    columnas_info = [col for col in ['state', 'city', 'store_type'] if col in columnas]
+    info = {col: (col, 'first') for col in columnas_info} or {'filas': ('store_nbr', 'size')}
+    agregados['info'] = origen.agrupar(['store_nbr'], info)
+
+    if 'year' in columnas and 'sales' in columnas:
+        agregados['ventas_anio'] = origen.agrupar(['store_nbr', 'year'], {'sales': ('sales', 'sum')})['sales']
+    if 'year' in columnas and 'transactions' in columnas:
+        agregados['transacciones_anio'] = origen.agrupar(['store_nbr', 'year'], {'transactions': ('transactions', 'sum')})['transactions']
+    if 'onpromotion' in columnas and 'sales' in columnas and 'year' in columnas:
+        agregados['promocion_anio'] = origen.agrupar(
+            ['store_nbr', 'year'], {'sales': ('sales', 'sum')}, solo_promocion=True
+        )['sales']
+    if 'family' in columnas and 'sales' in columnas:
+        agregados['ventas_familia'] = origen.agrupar(['store_nbr', 'family'], {'sales': ('sales', 'sum')})['sales']
+
+    return agregados
+
+
+def tramo(serie, clave):
+    # Filas de una entidad (primer nivel del índice) como DataFrame; vacío si no existe
+    try:
+        return serie.loc[clave].reset_index()
+    except KeyError:
+        return pd.DataFrame(columns=list(serie.index.names[1:]) + [serie.name])
+
+
+# Gráficos de una tienda a partir de los agregados
+def figuras_tienda(agregados, tienda):
+    figuras = {}
+
+    if 'ventas_anio' in agregados:
+        ventas_por_anio = tramo(agregados['ventas_anio'], tienda).sort_values('year')
+        if not ventas_por_anio.empty:
+            figuras['ventas_anio'] = px.bar(
+                ventas_por_anio,
+                x='year',
+                y='sales',
+                title=f"Ventas Totales por Año - Tienda {tienda}",
+                labels={'sales': 'Ventas Totales ($)', 'year': 'Año'},
+                color='sales',
+                color_continuous_scale='Blues'
+            )
+
+    if 'transacciones_anio' in agregados:
+        transacciones_por_anio = tramo(agregados['transacciones_anio'], tienda).sort_values('year')
+        if not transacciones_por_anio.empty:
+            fig = px.line(
+                transacciones_por_anio,
+                x='year',
+                y='transactions',
+                title=f"Transacciones por Año - Tienda {tienda}",
+                labels={'transactions': 'Número de Transacciones', 'year': 'Año'},
+                markers=True
+            )
+            fig.update_traces(line=dict(color='green', width=3))
+            figuras['transacciones_anio'] = fig
+
+    if 'promocion_anio' in agregados:
+        promocion_por_anio = tramo(agregados['promocion_anio'], tienda).sort_values('year')
+        if not promocion_por_anio.empty:
+            figuras['promocion_anio'] = px.bar(
+                promocion_por_anio,
+                x='year',
+                y='sales',
+                title=f"Ventas en Promoción por Año - Tienda {tienda}",
+                labels={'sales': 'Ventas en Promoción ($)', 'year': 'Año'},
+                color='sales',
+                color_continuous_scale='Reds'
+            )
+
+    if 'ventas_familia' in agregados:
+        ventas_familia_tienda = tramo(agregados['ventas_familia'], tienda)
+        ventas_familia_tienda = ventas_familia_tienda.sort_values('sales', ascending=False).head(10)
+        if not ventas_familia_tienda.empty:
+            fig = px.pie(
+                ventas_familia_tienda,
+                values='sales',
+                names='family',
+                title=f"Top 10 Familias de Producto - Tienda {tienda}",
+                hole=0.4
+            )
+            fig.update_traces(textposition='inside', textinfo='percent+label')
+            figuras['familias'] = fig
+
+    return figuras
+
+
+@memorizar()
+def calcular_agregados(_origen, version):
+    return agregar_tiendas(_origen)
+
+
+@memorizar(ttl=TTL_FIGURAS)
+def calcular_figuras(_agregados, version, tienda):
+    return figuras_tienda(_agregados, tienda)
+
+
+def mostrar(origen, version):
+    st.title("🏪 Información por Tienda")
+    st.markdown("---")
+
+    # Selector de tienda en la página principal (no en sidebar)
+    if 'store_nbr' in origen.columnas:
+        agregados = calcular_agregados(origen, version)
+        tiendas_unicas = list(agregados['info'].index)
+
+        if len(tiendas_unicas) > 0:
+            st.subheader("Selecciona una tienda para visualizar sus datos:")
+
+            tienda_seleccionada = st.selectbox(
+                "Tienda:",
+                tiendas_unicas,
+                key="selector_tienda_pagina2"
+            )
+
+            if tienda_seleccionada in agregados['info'].index:
+                # Obtener información de la tienda (con verificación de columnas)
+                info_tienda = agregados['info'].loc[tienda_seleccionada]
+                estado_tienda = info_tienda.get('state', "N/A")
+                ciudad_tienda = info_tienda.get('city', "N/A")
+                tipo_tienda = info_tienda.get('store_type', "N/A")
+
+                # Mostrar información de la tienda
+                st.header(f"Tienda {tienda_seleccionada} (Muestra)")
+
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Número de Tienda", tienda_seleccionada)
+                with col2:
+                    st.metric("Estado", estado_tienda)
+                with col3:
+                    st.metric("Ciudad", ciudad_tienda)
+                with col4:
+                    st.metric("Tipo de Tienda", tipo_tienda)
+
+                st.markdown("---")
+
+                # Crear gráficos para la tienda seleccionada
+                figuras = calcular_figuras(agregados, version, tienda_seleccionada)
+                col_chart1, col_chart2, col_chart3 = st.columns(3)
+
+                with col_chart1:
+                    if 'ventas_anio' in agregados:
+                        st.subheader("Ventas Totales por Año")
+                        if 'ventas_anio' in figuras:
+                            st.plotly_chart(figuras['ventas_anio'], use_container_width=True)
+
+                with col_chart2:
+                    if 'transacciones_anio' in agregados:
+                        st.subheader("Transacciones por Año")
+                        if 'transacciones_anio' in figuras:
+                            st.plotly_chart(figuras['transacciones_anio'], use_container_width=True)
+
+                with col_chart3:
+                    if 'promocion_anio' in agregados:
+                        st.subheader("Ventas en Promoción por Año")
+                        if 'promocion_anio' in figuras:
+                            st.plotly_chart(figuras['promocion_anio'], use_container_width=True)
+                        else:
+                            st.info("No hay ventas en promoción registradas.")
+
+                # Análisis adicional: Ventas por familia de producto en esta tienda
+                if 'ventas_familia' in agregados:
+                    st.subheader(f"Distribución de Ventas por Familia de Producto - Tienda {tienda_seleccionada}")
+                    if 'familias' in figuras:
+                        st.plotly_chart(figuras['familias'], use_container_width=True)
+
+                # Estacionalidad de la tienda (perfiles precalculados, sin recorrer los datos)
+                if 'date' in origen.columnas and 'sales' in origen.columnas:
+                    st.subheader(f"📅 Estacionalidad - Tienda {tienda_seleccionada}")
+                    mostrar_estacionalidad(
+                        perfiles_estacionalidad(origen, version), 'tienda', tienda_seleccionada,
+                        sufijo=f" - Tienda {tienda_seleccionada}"
+                    )
+
+            else:
+                st.warning(f"No se encontraron datos para la tienda {tienda_seleccionada} en la muestra")
+        else:
+            st.warning("No hay datos de tiendas en la muestra")
+    else:
+        st.error("No se encontró la columna 'store_nbr' en los datos")
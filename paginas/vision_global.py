@@ -0,0 +1,302 @@
+# ===========================================
+# PÁGINA 1: VISIÓN GLOBAL
+# ===========================================
+# Importación de librerías necesarias (solo se cargan al abrir esta página)
+import streamlit as st
+import plotly.express as px
+
+import estacionalidad
+from cache import memorizar
+from datos import perfiles_estacionalidad, resumen_muestra
+
+
+# Agregados de la página resueltos por el origen de los datos (en memoria o en la base de
+# datos), una vez por versión de los datos
+@memorizar()
+def calcular_agregados(_origen, version):
+    columnas = _origen.columnas
+    agregados = {}
+    if 'state' in columnas and 'store_nbr' in columnas:
+        agregados['tiendas_por_estado'] = _origen.agrupar(['state'], {'store_nbr': ('store_nbr', 'nunique')}).reset_index()
+    if 'family' in columnas and 'sales' in columnas:
+        agregados['top_familias'] = _origen.top_familias(10)
+    if 'store_nbr' in columnas and 'sales' in columnas:
+        agregados['ventas_tienda'] = _origen.agrupar(['store_nbr'], {'sales': ('sales', 'sum')}).reset_index()
+    if 'onpromotion' in columnas and 'sales' in columnas and 'store_nbr' in columnas:
+        agregados['promocion_tienda'] = _origen.agrupar(
+            ['store_nbr'], {'sales': ('sales', 'sum')}, solo_promocion=True
+        ).reset_index()
+        agregados['resumen_promocion'] = _origen.resumen_promocion()
+    return agregados
+
+
+# Pestañas de estacionalidad leídas de los perfiles precalculados. Las comparten la
+# Visión Global (nivel 'global') y las páginas de tienda y estado.
+def mostrar_estacionalidad(perfiles, nivel='global', entidad=None, sufijo=" - Muestra"):
+    clave = f"{nivel}_{entidad}"
+    sin_festivos = st.checkbox(
+        "Excluir días festivos (perfil ajustado)",
+        key=f"estacionalidad_sin_festivos_{nivel}",
+        help="Excluye los días con un festivo nacional, regional del estado o local de la ciudad de la tienda"
+    )
+    
+    # Crear pestañas para los diferentes análisis de estacionalidad
+    estacionalidad_tab1, estacionalidad_tab2, estacionalidad_tab3, estacionalidad_tab4 = st.tabs([
+        "📅 Día de la Semana", 
+        "📈 Volumen Semanal", 
+        "📊 Volumen Mensual",
+        "🎉 Festivos"
+    ])
+    
+    with estacionalidad_tab1:
+        st.subheader("Ventas por Día de la Semana")
+        
+        ventas_por_dia = estacionalidad.perfil(perfiles, 'dia', nivel, entidad, sin_festivos)
+        if not ventas_por_dia.empty:
+            fig = px.bar(
+                ventas_por_dia, 
+                x='etiqueta', 
+                y='sales',
+                title=f"Ventas Promedio por Día de la Semana{sufijo}",
+                labels={'sales': 'Ventas Promedio ($)', 'etiqueta': 'Día de la Semana'},
+                color='sales',
+                color_continuous_scale='Greens'
+            )
+            st.plotly_chart(fig, use_container_width=True, key=f"estacionalidad_dia_{clave}")
+            
+            dia_max_ventas = ventas_por_dia.loc[ventas_por_dia['sales'].idxmax(), 'etiqueta']
+            st.info(f"**Día con más ventas en promedio:** {dia_max_ventas}")
+    
+    with estacionalidad_tab2:
+        st.subheader("Volumen de Ventas Promedio por Semana del Año")
+        
+        ventas_por_semana = estacionalidad.perfil(perfiles, 'semana', nivel, entidad, sin_festivos)
+        if not ventas_por_semana.empty:
+            fig = px.line(
+                ventas_por_semana, 
+                x='semana', 
+                y='sales',
+                title=f"Ventas Promedio por Semana del Año (Todos los Años){sufijo}",
+                labels={'sales': 'Ventas Promedio ($)', 'semana': 'Semana del Año'},
+                markers=True
+            )
+            fig.update_traces(line=dict(color='blue', width=3))
+            st.plotly_chart(fig, use_container_width=True, key=f"estacionalidad_semana_{clave}")
+            
+            if len(ventas_por_semana) > 1:
+                semana_max = ventas_por_semana.loc[ventas_por_semana['sales'].idxmax(), 'semana']
+                semana_min = ventas_por_semana.loc[ventas_por_semana['sales'].idxmin(), 'semana']
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Semana con Más Ventas", f"Semana {int(semana_max)}")
+                with col2:
+                    st.metric("Semana con Menos Ventas", f"Semana {int(semana_min)}")
+    
+    with estacionalidad_tab3:
+        st.subheader("Volumen de Ventas Promedio por Mes")
+        
+        ventas_por_mes = estacionalidad.perfil(perfiles, 'mes', nivel, entidad, sin_festivos)
+        if not ventas_por_mes.empty:
+            fig = px.bar(
+                ventas_por_mes, 
+                x='etiqueta', 
+                y='sales',
+                title=f"Ventas Promedio por Mes (Todos los Años){sufijo}",
+                labels={'sales': 'Ventas Promedio ($)', 'etiqueta': 'Mes'},
+                color='sales',
+                color_continuous_scale='Purples'
+            )
+            st.plotly_chart(fig, use_container_width=True, key=f"estacionalidad_mes_{clave}")
+            
+            mes_max_ventas = ventas_por_mes.loc[ventas_por_mes['sales'].idxmax(), 'etiqueta']
+            st.info(f"**Mes con más ventas en promedio:** {mes_max_ventas}")
+    
+    with estacionalidad_tab4:
+        st.subheader("Ventas en Días Festivos frente a Días Normales")
+        
+        efecto = estacionalidad.efecto_festivos(perfiles, nivel, entidad)
+        if len(efecto) > 1:
+            fig = px.bar(
+                efecto, 
+                x='etiqueta', 
+                y='sales',
+                title=f"Ventas Promedio por Tipo de Día{sufijo}",
+                labels={'sales': 'Ventas Promedio ($)', 'etiqueta': 'Tipo de Día', 'registros': 'Registros'},
+                color='diferencia_pct',
+                color_continuous_scale='RdYlGn',
+                hover_data=['registros', 'diferencia_pct']
+            )
+            st.plotly_chart(fig, use_container_width=True, key=f"estacionalidad_festivos_{clave}")
+            st.caption("Solo cuentan los festivos que aplican a la tienda (nacionales, regionales de su estado o locales de su ciudad); "
+                       "los festivos trasladados y los días laborables recuperables se consideran días normales.")
+        else:
+            st.info("No hay días festivos aplicables en los datos seleccionados.")
+
+
+def mostrar(origen, version):
+    st.title("📈 Visión Global de Ventas")
+    st.markdown("---")
+    
+    columnas = origen.columnas
+    resumen = resumen_muestra(origen, version)
+    agregados = calcular_agregados(origen, version)
+    
+    # Crear pestañas dentro de la primera sección
+    tab_global1, tab_global2, tab_global3 = st.tabs([
+        "📊 Conteo General", 
+        "📋 Análisis en Términos Medios", 
+        "📅 Estacionalidad"
+    ])
+    
+    # ===========================================
+    # 1a. CONTEO GENERAL
+    # ===========================================
+    with tab_global1:
+        st.subheader("Conteo General de Métricas Clave")
+        
+        # Crear 4 columnas para mostrar las métricas
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            if 'tiendas' in resumen:
+                total_tiendas = resumen['tiendas']
+                st.metric("Número Total de Tiendas", total_tiendas, help="Valor real: ~54 tiendas")
+        
+        with col2:
+            if 'familias' in resumen:
+                total_productos = resumen['familias']
+                st.metric("Familias de Productos", total_productos)
+        
+        with col3:
+            if 'estados' in resumen:
+                total_estados = resumen['estados']
+                st.metric("Estados Operativos", total_estados, help="Valor real: ~16 estados")
+        
+        with col4:
+            if 'meses' in resumen:
+                meses_unicos = resumen['meses']
+                st.metric("Meses con Datos", meses_unicos)
+        
+        # Gráfico adicional: Distribución de tiendas por estado
+        st.subheader("Distribución de Tiendas por Estado")
+        
+        if 'tiendas_por_estado' in agregados:
+            tiendas_por_estado = agregados['tiendas_por_estado'].sort_values('store_nbr', ascending=False)
+            
+            if not tiendas_por_estado.empty:
+                fig = px.bar(
+                    tiendas_por_estado, 
+                    x='state', 
+                    y='store_nbr',
+                    title="Número de Tiendas por Estado (Muestra)",
+                    labels={'store_nbr': 'Número de Tiendas', 'state': 'Estado'},
+                    color='store_nbr',
+                    color_continuous_scale='Blues'
+                )
+                fig.update_layout(xaxis_tickangle=-45)
+                st.plotly_chart(fig, use_container_width=True)
+    
+    # ===========================================
+    # 1b. ANÁLISIS EN TÉRMINOS MEDIOS
+    # ===========================================
+    with tab_global2:
+        st.subheader("Análisis en Términos Medios")
+        
+        # Crear pestañas para los diferentes análisis
+        analisis_tab1, analisis_tab2, analisis_tab3 = st.tabs([
+            "📈 Top 10 Productos Más Vendidos", 
+            "🏪 Distribución de Ventas por Tienda", 
+            "🏆 Top 10 Tiendas con Promociones"
+        ])
+        
+        with analisis_tab1:
+            st.subheader("Top 10 Productos Más Vendidos (por familia)")
+            
+            if 'top_familias' in agregados:
+                ventas_por_familia = agregados['top_familias']
+                
+                if not ventas_por_familia.empty:
+                    fig = px.bar(
+                        ventas_por_familia, 
+                        y='family', 
+                        x='sales',
+                        orientation='h',
+                        title="Top 10 Familias de Productos por Ventas Totales (Muestra)",
+                        labels={'sales': 'Ventas Totales ($)', 'family': 'Familia de Producto'},
+                        color='sales',
+                        color_continuous_scale='Viridis'
+                    )
+                    fig.update_layout(yaxis={'categoryorder':'total ascending'})
+                    st.plotly_chart(fig, use_container_width=True)
+        
+        with analisis_tab2:
+            st.subheader("Distribución de Ventas por Tienda")
+            
+            if 'ventas_tienda' in agregados:
+                ventas_por_tienda = agregados['ventas_tienda']
+                
+                if not ventas_por_tienda.empty:
+                    fig = px.histogram(
+                        ventas_por_tienda, 
+                        x='sales',
+                        nbins=20,  # Reducido para muestra
+                        title="Distribución de Ventas Totales por Tienda (Muestra)",
+                        labels={'sales': 'Ventas Totales ($)', 'count': 'Número de Tiendas'},
+                        color_discrete_sequence=['#636EFA']
+                    )
+                    if ventas_por_tienda['sales'].mean() > 0:
+                        fig.add_vline(x=ventas_por_tienda['sales'].mean(), line_dash="dash", 
+                                     line_color="red", annotation_text="Media")
+                    st.plotly_chart(fig, use_container_width=True)
+                    
+                    col1, col2, col3, col4 = st.columns(4)
+                    with col1:
+                        if ventas_por_tienda['sales'].mean() > 0:
+                            st.metric("Media", f"${ventas_por_tienda['sales'].mean():,.2f}")
+                    with col2:
+                        if ventas_por_tienda['sales'].median() > 0:
+                            st.metric("Mediana", f"${ventas_por_tienda['sales'].median():,.2f}")
+                    with col3:
+                        if ventas_por_tienda['sales'].max() > 0:
+                            st.metric("Máximo", f"${ventas_por_tienda['sales'].max():,.2f}")
+                    with col4:
+                        st.metric("Mínimo", f"${ventas_por_tienda['sales'].min():,.2f}")
+        
+        with analisis_tab3:
+            st.subheader("Top 10 Tiendas con Ventas en Promoción")
+            
+            if 'promocion_tienda' in agregados:
+                promocion_por_tienda = agregados['promocion_tienda']
+                
+                if not promocion_por_tienda.empty:
+                    promocion_por_tienda = promocion_por_tienda.sort_values('sales', ascending=False).head(10)
+                    
+                    if not promocion_por_tienda.empty:
+                        fig = px.bar(
+                            promocion_por_tienda, 
+                            x='store_nbr', 
+                            y='sales',
+                            title="Top 10 Tiendas por Ventas en Promoción (Muestra)",
+                            labels={'sales': 'Ventas en Promoción ($)', 'store_nbr': 'Número de Tienda'},
+                            color='sales',
+                            color_continuous_scale='Reds'
+                        )
+                        st.plotly_chart(fig, use_container_width=True)
+                        
+                        porcentaje_promocion = agregados['resumen_promocion']['porcentaje_promocion']
+                        if porcentaje_promocion is not None:
+                            st.metric("Porcentaje de Ventas en Promoción", f"{porcentaje_promocion:.2f}%")
+                    else:
+                        st.info("No hay suficientes datos de promoción para mostrar el top 10")
+                else:
+                    st.info("No hay ventas en promoción registradas en la muestra")
+    
+    # ===========================================
+    # 1c. ANÁLISIS DE ESTACIONALIDAD
+    # ===========================================
+    with tab_global3:
+        st.subheader("Análisis de Estacionalidad de Ventas")
+        
+        if all(col in columnas for col in ['date', 'sales']):
+            mostrar_estacionalidad(perfiles_estacionalidad(origen, version))
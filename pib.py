@@ -0,0 +1,106 @@
+# Tabla del PIB (Banco Mundial) en formato largo e indexada por país
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RUTA_PIB = Path(__file__).parent / 'data' / 'gdp_data.csv'
+
+# codigos/nombres: un elemento por país, ordenados por código
+# inicio: desplazamientos (n_paises + 1) dentro de los arrays planos
+# anio/pib: pares (año, PIB) de todos los países, ordenados por (país, año)
+TablaPIB = namedtuple('TablaPIB', ['codigos', 'nombres', 'inicio', 'anio', 'pib'])
+
+
+def cargar_tabla_pib(ruta=RUTA_PIB):
+    ancho = pd.read_csv(ruta)
+
+    # Solo las columnas de año (1960-2022); se descartan la columna vacía final y los metadatos
+    columnas_anio = [col for col in ancho.columns if str(col).strip().isdigit()]
+    anios = np.array([int(col) for col in columnas_anio], dtype=np.int16)
+
+    # Ordenar los países por código para poder localizarlos con búsqueda binaria
+    ancho = ancho.sort_values('Country Code', kind='stable')
+    codigos = ancho['Country Code'].to_numpy(dtype=str)
+    nombres = ancho['Country Name'].to_numpy(dtype=str)
+    valores = ancho[columnas_anio].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+
+    # "Melt" vectorizado: aplanar la matriz país x año y quedarse con las celdas con dato
+    validos = ~np.isnan(valores)
+    inicio = np.zeros(len(codigos) + 1, dtype=np.int64)
+    np.cumsum(validos.sum(axis=1), out=inicio[1:])
+
+    anio = np.broadcast_to(anios, valores.shape)[validos]
+    pib = valores[validos]
+
+    return TablaPIB(codigos, nombres, inicio, anio, pib)
+
+
+def posicion_pais(tabla, codigo):
+    i = int(np.searchsorted(tabla.codigos, codigo))
+    if i == len(tabla.codigos) or tabla.codigos[i] != codigo:
+        raise KeyError(f"País no encontrado en la tabla del PIB: {codigo}")
+    return i
+
+
+def serie_pib(tabla, codigo, anio_desde=None, anio_hasta=None):
+    # Devuelve (años, PIB) de un país restringidos al rango [anio_desde, anio_hasta]
+    i = posicion_pais(tabla, codigo)
+    a, b = tabla.inicio[i], tabla.inicio[i + 1]
+    anios_pais = tabla.anio[a:b]
+
+    desde = 0 if anio_desde is None else np.searchsorted(anios_pais, anio_desde, side='left')
+    hasta = len(anios_pais) if anio_hasta is None else np.searchsorted(anios_pais, anio_hasta, side='right')
+
+    return tabla.anio[a + desde:a + hasta], tabla.pib[a + desde:a + hasta]
+
+
+def seleccionar_pib(tabla, codigos, anio_desde=None, anio_hasta=None):
+    # Tabla larga (country_code, country_name, year, gdp) para varios países y un rango de años
+    partes = []
+    for codigo in codigos:
+        anios, valores = serie_pib(tabla, codigo, anio_desde, anio_hasta)
+        partes.append(pd.DataFrame({
+            'country_code': codigo,
+            'country_name': tabla.nombres[posicion_pais(tabla, codigo)],
+            'year': anios,
+            'gdp': valores
+        }))
+
+    if not partes:
+        return pd.DataFrame(columns=['country_code', 'country_name', 'year', 'gdp'])
+    return pd.concat(partes, ignore_index=True)
+
+
+def pib_ventas_mensuales(tabla, ventas_mensuales, codigo='ECU'):
+    # Asigna a cada mes (year, month, sales) el PIB anual del país en ese año
+    anios, valores = serie_pib(tabla, codigo)
+    resultado = ventas_mensuales[['year', 'month', 'sales']].copy()
+
+    if len(anios) == 0:
+        resultado['gdp'] = np.nan
+        return resultado
+
+    anios_ventas = resultado['year'].to_numpy()
+    idx = np.clip(np.searchsorted(anios, anios_ventas), 0, len(anios) - 1)
+    resultado['gdp'] = np.where(anios[idx] == anios_ventas, valores[idx], np.nan)
+
+    return resultado
+
+
+def correlacion_pib_ventas(pib_mensual):
+    # Correlación mensual (ventas de cada mes frente al PIB de su año) y anual
+    # (ventas medias mensuales por año frente al PIB, para no penalizar años incompletos)
+    datos = pib_mensual.dropna(subset=['gdp'])
+    corr_mensual = np.nan
+    corr_anual = np.nan
+
+    if len(datos) > 2 and datos['gdp'].nunique() > 1:
+        corr_mensual = float(np.corrcoef(datos['sales'], datos['gdp'])[0, 1])
+
+    anual = datos.groupby('year').agg(sales=('sales', 'mean'), gdp=('gdp', 'first'))
+    if len(anual) > 2:
+        corr_anual = float(np.corrcoef(anual['sales'], anual['gdp'])[0, 1])
+
+    return corr_mensual, corr_anual
@@ -0,0 +1,129 @@
+# Simulador "qué pasaría si" de promociones sobre un cubo familia x tienda x mes del año
+#
+# El efecto de las promociones se estima por familia como una elasticidad:
+#   log(1 + ventas) = efecto fijo + b_familia * log(1 + productos en promoción)
+# con efectos fijos por familia x tienda (comparando cada tienda consigo misma). Las
+# familias con poca variación en promociones se contraen hacia la estimación con
+# efectos fijos solo por familia, y esta hacia la elasticidad conjunta.
+#
+# La proyección de cada celda del cubo es
+#   (1 + ventas medias) * ((1 + promociones nuevas) / (1 + promociones medias)) ^ b - 1
+# y se calcula para todo el cubo a la vez con operaciones de arrays.
+import numpy as np
+import pandas as pd
+
+MESES = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun', 'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic']
+
+# Peso (en unidades de suma de cuadrados de log(1 + promociones)) de la estimación previa
+CONTRACCION = 5.0
+
+# Por debajo de estos registros con promoción, la elasticidad de una familia se apoya
+# sobre todo en la estimación previa (contracción) y no en sus propios datos
+MIN_OBSERVACIONES_PROMOCION = 30
+
+
+def _pendientes(grupos, familias, x, y, n_familias):
+    # Sumas Sxy y Sxx por familia tras restar la media de cada grupo (efectos fijos)
+    n_grupos = grupos.max() + 1 if len(grupos) else 0
+    conteo = np.bincount(grupos, minlength=n_grupos)
+    conteo[conteo == 0] = 1
+    x_c = x - (np.bincount(grupos, weights=x, minlength=n_grupos) / conteo)[grupos]
+    y_c = y - (np.bincount(grupos, weights=y, minlength=n_grupos) / conteo)[grupos]
+    sxy = np.bincount(familias, weights=x_c * y_c, minlength=n_familias)
+    sxx = np.bincount(familias, weights=x_c * x_c, minlength=n_familias)
+    return sxy, sxx
+
+
+def estimar_elasticidades(familias, tiendas, x, y, n_familias, n_tiendas, contraccion=CONTRACCION):
+    # Elasticidad conjunta y por familia (con efectos fijos por familia)
+    sxy_familia, sxx_familia = _pendientes(familias, familias, x, y, n_familias)
+    conjunta = sxy_familia.sum() / sxx_familia.sum() if sxx_familia.sum() > 0 else 0.0
+    previa = (sxy_familia + contraccion * conjunta) / (sxx_familia + contraccion)
+
+    # Con efectos fijos por familia x tienda, contraída hacia la previa
+    sxy, sxx = _pendientes(familias * n_tiendas + tiendas, familias, x, y, n_familias)
+    return (sxy + contraccion * previa) / (sxx + contraccion), conjunta
+
+
+def construir_cubo(df):
+    # Totales de ventas, productos en promoción y observaciones por familia x tienda x mes
+    codigos_familia, familias = pd.factorize(df['family'], sort=True)
+    codigos_tienda, tiendas = pd.factorize(df['store_nbr'], sort=True)
+    meses = df['month'].to_numpy(dtype=np.int64) - 1
+    ventas = np.clip(df['sales'].to_numpy(dtype=np.float64), 0, None)
+    promocion = np.clip(df['onpromotion'].to_numpy(dtype=np.float64), 0, None)
+
+    validos = (codigos_familia >= 0) & (codigos_tienda >= 0) & (meses >= 0) & (meses < 12)
+    validos &= np.isfinite(ventas) & np.isfinite(promocion)
+    codigos_familia, codigos_tienda, meses = codigos_familia[validos], codigos_tienda[validos], meses[validos]
+    ventas, promocion = ventas[validos], promocion[validos]
+
+    forma = (len(familias), len(tiendas), 12)
+    celdas = (codigos_familia * forma[1] + codigos_tienda) * 12 + meses
+    tamano = forma[0] * forma[1] * 12
+
+    elasticidades, conjunta = estimar_elasticidades(
+        codigos_familia, codigos_tienda, np.log1p(promocion), np.log1p(ventas), forma[0], forma[1]
+    )
+
+    return {
+        'familias': np.asarray(familias),
+        'tiendas': np.asarray(tiendas),
+        'ventas': np.bincount(celdas, weights=ventas, minlength=tamano).reshape(forma),
+        'promocion': np.bincount(celdas, weights=promocion, minlength=tamano).reshape(forma),
+        'observaciones': np.bincount(celdas, minlength=tamano).reshape(forma).astype(np.float64),
+        'elasticidades': elasticidades,
+        'elasticidad_conjunta': conjunta,
+        'observaciones_promocion': np.bincount(codigos_familia, weights=promocion > 0, minlength=forma[0])
+    }
+
+
+def intensidad(cubo, familias=None, tiendas=None, meses=None, multiplicador=1.0, adicionales=0.0):
+    # Multiplicador y productos adicionales en promoción para cada celda del cubo.
+    # La selección vacía (None o lista vacía) equivale a todas las familias/tiendas/meses.
+    forma = cubo['ventas'].shape
+    seleccion = [
+        np.isin(cubo['familias'], familias) if familias else np.ones(forma[0], dtype=bool),
+        np.isin(cubo['tiendas'], tiendas) if tiendas else np.ones(forma[1], dtype=bool),
+        np.isin(np.arange(1, 13), meses) if meses else np.ones(12, dtype=bool)
+    ]
+    mascara = seleccion[0][:, None, None] & seleccion[1][None, :, None] & seleccion[2][None, None, :]
+    return np.where(mascara, multiplicador, 1.0), np.where(mascara, adicionales, 0.0)
+
+
+def simular(cubo, multiplicador=1.0, adicionales=0.0):
+    # Ventas proyectadas por celda (familia x tienda x mes) para la intensidad de promoción dada
+    n = cubo['observaciones']
+    con_datos = n > 0
+    ventas_medias = np.divide(cubo['ventas'], n, out=np.zeros_like(n), where=con_datos)
+    promocion_media = np.divide(cubo['promocion'], n, out=np.zeros_like(n), where=con_datos)
+    promocion_nueva = np.maximum(promocion_media * multiplicador + adicionales, 0.0)
+
+    factor = ((1.0 + promocion_nueva) / (1.0 + promocion_media)) ** cubo['elasticidades'][:, None, None]
+    return np.maximum((1.0 + ventas_medias) * factor - 1.0, 0.0) * n
+
+
+def resumen_simulacion(cubo, proyectadas):
+    # Ventas base y proyectadas agregadas por familia, tienda y mes
+    base = cubo['ventas']
+    return {
+        'familia': pd.DataFrame({
+            'family': cubo['familias'],
+            'base': base.sum(axis=(1, 2)),
+            'proyectadas': proyectadas.sum(axis=(1, 2)),
+            'elasticidad': cubo['elasticidades'],
+            'observaciones_promocion': cubo['observaciones_promocion'].astype(np.int64),
+            'estimacion_previa': cubo['observaciones_promocion'] < MIN_OBSERVACIONES_PROMOCION
+        }),
+        'tienda': pd.DataFrame({
+            'store_nbr': cubo['tiendas'],
+            'base': base.sum(axis=(0, 2)),
+            'proyectadas': proyectadas.sum(axis=(0, 2))
+        }),
+        'mes': pd.DataFrame({
+            'month': np.arange(1, 13),
+            'mes': MESES,
+            'base': base.sum(axis=(0, 1)),
+            'proyectadas': proyectadas.sum(axis=(0, 1))
+        })
+    }
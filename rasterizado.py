@@ -0,0 +1,181 @@
+# ===========================================
+# RASTERIZADO EN EL SERVIDOR PARA DIAGRAMAS DE DISPERSIÓN DENSOS
+# ===========================================
+# En lugar de enviar millones de puntos al navegador, los puntos se agrupan en una
+# rejilla de píxeles (histograma 2D) con NumPy y solo se envía la imagen.
+#
+# Una vez por par de variables se construye una pirámide de rejillas dispersas
+# (celdas no vacías ordenadas por fila y su conteo) a varias resoluciones, y se
+# ordenan los puntos por su celda más fina. Al cambiar la vista se usa la rejilla
+# más gruesa con resolución suficiente y solo se leen sus celdas visibles; si el
+# zoom supera la rejilla más fina, se leen solo los puntos visibles. El coste
+# depende de las celdas de la vista, no del número total de filas.
+import numpy as np
+
+VARIABLES = {
+    'sales': 'Ventas ($)',
+    'transactions': 'Transacciones',
+    'dcoilwtico': 'Precio del Petróleo WTI ($)',
+    'onpromotion': 'Productos en Promoción'
+}
+
+# Resoluciones de la pirámide (cada una divide a la siguiente)
+NIVELES = (1024, 4096, 16384)
+
+# Celdas de rejilla por píxel de salida necesarias para usar una rejilla
+SOBREMUESTREO = 2
+
+
+def _indices(valores, inicio, fin, n):
+    # Índice de bin de cada valor en [inicio, fin) con n bins (-1 si queda fuera)
+    escala = n / (fin - inicio) if fin > inicio else 0.0
+    idx = np.floor((valores - inicio) * escala).astype(np.int64)
+    # El extremo superior se incluye en el último bin
+    idx[valores == fin] = n - 1
+    idx[(idx < 0) | (idx >= n)] = -1
+    return idx
+
+
+def histograma_2d(xs, ys, rango_x, rango_y, ancho, alto, pesos=None):
+    # Conteo de puntos por píxel (alto x ancho) con una sola llamada a bincount
+    ix = _indices(xs, rango_x[0], rango_x[1], ancho)
+    iy = _indices(ys, rango_y[0], rango_y[1], alto)
+    dentro = (ix >= 0) & (iy >= 0)
+    celdas = iy[dentro] * ancho + ix[dentro]
+    conteos = np.bincount(celdas, weights=None if pesos is None else pesos[dentro], minlength=ancho * alto)
+    return conteos.reshape(alto, ancho)
+
+
+def construir_indice(xs, ys, niveles=NIVELES, log=False):
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    if log:
+        # log1p para variables no negativas con colas largas (ventas, transacciones)
+        xs = np.log1p(np.clip(xs, 0, None))
+        ys = np.log1p(np.clip(ys, 0, None))
+
+    validos = np.isfinite(xs) & np.isfinite(ys)
+    xs, ys = xs[validos], ys[validos]
+
+    if len(xs) == 0:
+        extension_x = extension_y = (0.0, 1.0)
+    else:
+        x0, x1 = float(xs.min()), float(xs.max())
+        y0, y1 = float(ys.min()), float(ys.max())
+        extension_x = (x0, x1 if x1 > x0 else x0 + 1.0)
+        extension_y = (y0, y1 if y1 > y0 else y0 + 1.0)
+
+    # Celda de cada punto en la rejilla más fina; los puntos se ordenan por ella
+    fina = niveles[-1]
+    ix = np.clip(_indices(xs, *extension_x, fina), 0, fina - 1)
+    iy = np.clip(_indices(ys, *extension_y, fina), 0, fina - 1)
+    celdas = iy * fina + ix
+    orden = np.argsort(celdas, kind='stable')
+    celdas, ix, iy = celdas[orden], ix[orden], iy[orden]
+
+    rejillas = []
+    for resolucion in niveles:
+        factor = fina // resolucion
+        if factor == 1:
+            # La rejilla más fina ya está ordenada: basta con contar tramos iguales
+            cortes = np.flatnonzero(np.diff(celdas)) + 1
+            celdas_nivel = celdas[np.r_[0, cortes]] if len(celdas) else celdas
+            conteos = np.diff(np.r_[0, cortes, len(celdas)]) if len(celdas) else celdas
+        else:
+            celdas_nivel, conteos = np.unique((iy // factor) * resolucion + ix // factor, return_counts=True)
+        rejillas.append({'resolucion': resolucion, 'celdas': celdas_nivel, 'conteos': conteos.astype(np.float64)})
+
+    return {
+        'xs': xs[orden],
+        'ys': ys[orden],
+        'celdas': celdas,
+        'extension_x': extension_x,
+        'extension_y': extension_y,
+        'rejillas': rejillas,
+        'log': log
+    }
+
+
+def _rectangulo(indice, resolucion, rango_x, rango_y):
+    # Celdas [ix0, ix1) x [iy0, iy1) de una rejilla que cubren la vista
+    (x0, x1), (y0, y1) = indice['extension_x'], indice['extension_y']
+    ix0 = int(np.floor((rango_x[0] - x0) / (x1 - x0) * resolucion))
+    ix1 = int(np.ceil((rango_x[1] - x0) / (x1 - x0) * resolucion))
+    iy0 = int(np.floor((rango_y[0] - y0) / (y1 - y0) * resolucion))
+    iy1 = int(np.ceil((rango_y[1] - y0) / (y1 - y0) * resolucion))
+    return max(ix0, 0), min(max(ix1, ix0 + 1), resolucion), max(iy0, 0), min(max(iy1, iy0 + 1), resolucion)
+
+
+def _posiciones_visibles(celdas, resolucion, ix0, ix1, iy0, iy1):
+    # Posiciones (en un array de celdas ordenado por fila) de las celdas dentro del
+    # rectángulo: un tramo contiguo por fila, localizado con búsqueda binaria
+    filas = np.arange(iy0, iy1, dtype=np.int64) * resolucion
+    inicio = np.searchsorted(celdas, filas + ix0, side='left')
+    fin = np.searchsorted(celdas, filas + ix1, side='left')
+    longitudes = fin - inicio
+    total = int(longitudes.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    desplazamiento = np.repeat(inicio - np.cumsum(longitudes) + longitudes, longitudes)
+    return desplazamiento + np.arange(total)
+
+
+def _bordes_en_pixeles(i, inicio, paso, rango, n):
+    # Borde izquierdo de cada celda y su ancho, en unidades de píxel de la vista
+    escala = n / (rango[1] - rango[0])
+    return (inicio + i * paso - rango[0]) * escala, paso * escala
+
+
+def _repartir_celdas(ix, iy, pesos, indice, resolucion, rango_x, rango_y, ancho, alto):
+    # Cada celda de la rejilla es menor que un píxel: su conteo se reparte entre los
+    # (como mucho) 2x2 píxeles que solapa, en proporción al área. Asignarla entera al
+    # píxel de su centro produce bandas cuando la escala no es entera.
+    (x0, x1), (y0, y1) = indice['extension_x'], indice['extension_y']
+    bx, wx = _bordes_en_pixeles(ix, x0, (x1 - x0) / resolucion, rango_x, ancho)
+    by, wy = _bordes_en_pixeles(iy, y0, (y1 - y0) / resolucion, rango_y, alto)
+    px, py = np.floor(bx).astype(np.int64), np.floor(by).astype(np.int64)
+    fx = np.clip((px + 1 - bx) / wx, 0.0, 1.0)
+    fy = np.clip((py + 1 - by) / wy, 0.0, 1.0)
+
+    # Rejilla de salida con un píxel de margen en cada lado para no filtrar por bordes
+    px = np.clip(px, -1, ancho) + 1
+    py = np.clip(py, -1, alto) + 1
+    ancho_m, alto_m = ancho + 3, alto + 3
+    base = py * ancho_m + px
+    conteos = np.zeros(ancho_m * alto_m)
+    for desplazamiento, parte in ((0, fx * fy), (1, (1.0 - fx) * fy),
+                                  (ancho_m, fx * (1.0 - fy)), (ancho_m + 1, (1.0 - fx) * (1.0 - fy))):
+        conteos += np.bincount(base + desplazamiento, weights=pesos * parte, minlength=ancho_m * alto_m)
+    return conteos.reshape(alto_m, ancho_m)[1:alto + 1, 1:ancho + 1]
+
+
+def rasterizar_vista(indice, rango_x=None, rango_y=None, ancho=400, alto=300):
+    # Devuelve (conteos alto x ancho, centros_x, centros_y, origen, elementos_leidos).
+    # Los rangos y los centros están en el espacio del índice (log1p si log=True).
+    rango_x = rango_x or indice['extension_x']
+    rango_y = rango_y or indice['extension_y']
+
+    for rejilla in indice['rejillas']:
+        resolucion = rejilla['resolucion']
+        ix0, ix1, iy0, iy1 = _rectangulo(indice, resolucion, rango_x, rango_y)
+        if (ix1 - ix0) >= SOBREMUESTREO * ancho and (iy1 - iy0) >= SOBREMUESTREO * alto:
+            # Re-agrupar las celdas visibles de la rejilla (ponderadas por su conteo) en los píxeles
+            posiciones = _posiciones_visibles(rejilla['celdas'], resolucion, ix0, ix1, iy0, iy1)
+            celdas = rejilla['celdas'][posiciones]
+            conteos = _repartir_celdas(
+                celdas % resolucion, celdas // resolucion, rejilla['conteos'][posiciones],
+                indice, resolucion, rango_x, rango_y, ancho, alto
+            )
+            origen = f"rejilla {resolucion}x{resolucion}"
+            break
+    else:
+        # Zoom mayor que la rejilla más fina: solo los puntos de las celdas visibles
+        fina = indice['rejillas'][-1]['resolucion']
+        posiciones = _posiciones_visibles(indice['celdas'], fina, *_rectangulo(indice, fina, rango_x, rango_y))
+        conteos = histograma_2d(indice['xs'][posiciones], indice['ys'][posiciones], rango_x, rango_y, ancho, alto)
+        origen = "puntos"
+
+    centros_x = rango_x[0] + (np.arange(ancho) + 0.5) * (rango_x[1] - rango_x[0]) / ancho
+    centros_y = rango_y[0] + (np.arange(alto) + 0.5) * (rango_y[1] - rango_y[0]) / alto
+
+    return conteos, centros_x, centros_y, origen, len(posiciones)
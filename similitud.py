@@ -0,0 +1,180 @@
+# Similitud entre tiendas y agrupamiento k-means sobre una matriz tienda x características
+import numpy as np
+import pandas as pd
+
+COLUMNAS_INFO = ['city', 'state', 'store_type', 'cluster']
+ORDEN_DIAS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def _proporciones(tabla):
+    # Normaliza cada fila para que sume 1 (filas sin ventas quedan a 0)
+    totales = tabla.sum(axis=1).to_numpy()[:, None]
+    return np.divide(tabla.to_numpy(dtype=np.float64), totales, out=np.zeros(tabla.shape), where=totales > 0)
+
+
+def _estandarizar(bloque):
+    # z-score por columna y peso 1/sqrt(n_columnas) para que cada bloque cuente igual
+    media = bloque.mean(axis=0)
+    desviacion = bloque.std(axis=0)
+    desviacion[desviacion == 0] = 1.0
+    return (bloque - media) / desviacion / np.sqrt(bloque.shape[1])
+
+
+def matriz_caracteristicas(df):
+    # Bloques: mezcla de familias, perfil semanal, % ventas en promoción y transacciones medias
+    tiendas = np.sort(df['store_nbr'].dropna().unique())
+
+    mezcla = df.groupby(['store_nbr', 'family'])['sales'].sum().unstack(fill_value=0).reindex(tiendas, fill_value=0)
+    semana = (
+        df.groupby(['store_nbr', 'day_of_week'])['sales'].mean().unstack()
+        .reindex(index=tiendas, columns=ORDEN_DIAS).fillna(0)
+    )
+
+    ventas = df.groupby('store_nbr')['sales'].sum().reindex(tiendas, fill_value=0).to_numpy()
+    ventas_promocion = df[df['onpromotion'] > 0].groupby('store_nbr')['sales'].sum().reindex(tiendas, fill_value=0).to_numpy()
+    promocion = np.divide(ventas_promocion, ventas, out=np.zeros(len(tiendas)), where=ventas > 0)
+
+    transacciones = df.groupby('store_nbr')['transactions'].mean().reindex(tiendas).fillna(0).to_numpy()
+
+    bloques = [
+        _proporciones(mezcla),
+        _proporciones(semana),
+        promocion[:, None],
+        np.log1p(transacciones)[:, None]
+    ]
+    nombres = (
+        [f"familia: {familia}" for familia in mezcla.columns]
+        + [f"día: {dia}" for dia in ORDEN_DIAS]
+        + ['% promoción', 'log transacciones']
+    )
+
+    X = np.hstack([_estandarizar(bloque) for bloque in bloques])
+    return tiendas, nombres, X
+
+
+def similitud_coseno(X):
+    normas = np.linalg.norm(X, axis=1, keepdims=True)
+    Xn = np.divide(X, normas, out=np.zeros_like(X), where=normas > 0)
+    return Xn @ Xn.T
+
+
+def _distancias_cuadradas(X, centroides):
+    # ||x - c||^2 para todos los pares a la vez
+    return np.maximum(
+        (X ** 2).sum(axis=1)[:, None] + (centroides ** 2).sum(axis=1)[None, :] - 2.0 * X @ centroides.T,
+        0.0
+    )
+
+
+def _inicializar_kmeanspp(X, k, rng):
+    centroides = [X[rng.integers(len(X))]]
+    for _ in range(1, k):
+        d2 = _distancias_cuadradas(X, np.array(centroides)).min(axis=1)
+        probabilidades = d2 / d2.sum() if d2.sum() > 0 else np.full(len(X), 1.0 / len(X))
+        centroides.append(X[rng.choice(len(X), p=probabilidades)])
+    return np.array(centroides)
+
+
+def kmeans(X, k, n_init=10, max_iter=100, semilla=0):
+    # Lloyd vectorizado: asignación y actualización de centroides con operaciones matriciales.
+    # Se conserva la mejor de `n_init` inicializaciones k-means++.
+    rng = np.random.default_rng(semilla)
+    k = min(k, len(X))
+    mejor = (np.inf, None, None)
+
+    for _ in range(n_init):
+        centroides = _inicializar_kmeanspp(X, k, rng)
+        etiquetas = np.full(len(X), -1)
+
+        for _ in range(max_iter):
+            nuevas = _distancias_cuadradas(X, centroides).argmin(axis=1)
+            if np.array_equal(nuevas, etiquetas):
+                break
+            etiquetas = nuevas
+
+            # Suma de puntos y tamaño por grupo sin bucles por grupo
+            sumas = np.zeros_like(centroides)
+            np.add.at(sumas, etiquetas, X)
+            tamanos = np.bincount(etiquetas, minlength=k)[:, None]
+            centroides = np.where(tamanos > 0, sumas / np.maximum(tamanos, 1), centroides)
+
+        inercia = _distancias_cuadradas(X, centroides)[np.arange(len(X)), etiquetas].sum()
+        if inercia < mejor[0]:
+            mejor = (inercia, etiquetas, centroides)
+
+    return mejor[1], mejor[2], float(mejor[0])
+
+
+def proyeccion_2d(X):
+    # Componentes principales para visualizar las tiendas en un plano
+    centrado = X - X.mean(axis=0)
+    u, s, _ = np.linalg.svd(centrado, full_matrices=False)
+    return u[:, :2] * s[:2]
+
+
+def construir_modelo(df, k=5, semilla=0):
+    tiendas, nombres, X = matriz_caracteristicas(df)
+    similitud = similitud_coseno(X)
+
+    # Vecinos ordenados de más a menos similar (sin la propia tienda)
+    sin_diagonal = similitud.copy()
+    np.fill_diagonal(sin_diagonal, -np.inf)
+    vecinos = np.argsort(-sin_diagonal, axis=1, kind='stable')[:, :-1]
+
+    etiquetas, centroides, inercia = kmeans(X, k, semilla=semilla)
+
+    modelo = {
+        'tiendas': tiendas,
+        'caracteristicas': nombres,
+        'X': X,
+        'similitud': similitud,
+        'vecinos': vecinos,
+        'etiquetas': etiquetas,
+        'centroides': centroides,
+        'inercia': inercia,
+        'proyeccion': proyeccion_2d(X),
+        # Datos descriptivos de cada tienda para las tablas y el mapa
+        'info': df.groupby('store_nbr')[[col for col in COLUMNAS_INFO if col in df.columns]].first().reindex(tiendas)
+    }
+    modelo['grupos'] = agregados_por_grupo(modelo, df)
+    return modelo
+
+
+def tiendas_similares(modelo, tienda, n=5):
+    i = int(np.searchsorted(modelo['tiendas'], tienda))
+    if i == len(modelo['tiendas']) or modelo['tiendas'][i] != tienda:
+        raise KeyError(f"Tienda no encontrada: {tienda}")
+
+    indices = modelo['vecinos'][i, :n]
+    return pd.DataFrame({
+        'store_nbr': modelo['tiendas'][indices],
+        'similitud': modelo['similitud'][i, indices],
+        'grupo_kmeans': modelo['etiquetas'][indices]
+    })
+
+
+def agregados_por_grupo(modelo, df):
+    # Resumen de cada grupo k-means: tamaño, ventas, % promoción y tipos/clusters originales
+    grupos = pd.DataFrame({'store_nbr': modelo['tiendas'], 'grupo_kmeans': modelo['etiquetas']})
+    info = df.groupby('store_nbr').agg(
+        sales=('sales', 'sum'),
+        store_type=('store_type', 'first'),
+        cluster=('cluster', 'first')
+    ).reset_index()
+    ventas_promocion = df[df['onpromotion'] > 0].groupby('store_nbr')['sales'].sum().rename('sales_promocion').reset_index()
+
+    tabla = grupos.merge(info, on='store_nbr', how='left').merge(ventas_promocion, on='store_nbr', how='left').fillna({'sales_promocion': 0})
+
+    resumen = tabla.groupby('grupo_kmeans').agg(
+        tiendas=('store_nbr', 'count'),
+        ventas_medias=('sales', 'mean'),
+        ventas_promocion=('sales_promocion', 'sum'),
+        ventas_totales=('sales', 'sum'),
+        tipos=('store_type', lambda s: ', '.join(f"{t} ({n})" for t, n in s.value_counts().items())),
+        clusters=('cluster', lambda s: ', '.join(str(c) for c in sorted(s.unique())))
+    ).reset_index()
+    resumen['porcentaje_promocion'] = np.where(
+        resumen['ventas_totales'] > 0, resumen['ventas_promocion'] / resumen['ventas_totales'] * 100, 0.0
+    )
+
+    return resumen.drop(columns=['ventas_promocion', 'ventas_totales'])
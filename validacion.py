@@ -0,0 +1,151 @@
+# ===========================================
+# VALIDACIÓN DE LOS DATOS DE VENTAS Y CUARENTENA
+# ===========================================
+# Todas las reglas se evalúan de forma vectorizada sobre columnas completas y se
+# acumulan en un único código de motivos por fila (un bit por regla).
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FECHA_MIN = pd.Timestamp('2013-01-01')
+FECHA_MAX = pd.Timestamp('2017-12-31')
+TIENDA_MIN, TIENDA_MAX = 1, 54
+
+RUTA_CUARENTENA = Path('cuarentena') / 'cuarentena_ventas.csv'
+
+MOTIVOS = {
+    1: 'fecha inválida',
+    2: 'fecha fuera de 2013-2017',
+    4: 'tienda inválida',
+    8: 'ventas no numéricas',
+    16: 'ventas negativas',
+    32: 'promoción no numérica o negativa',
+    64: 'transacciones no numéricas o negativas',
+    128: 'tienda incoherente con ciudad/estado/tipo'
+}
+
+# Columnas numéricas cuyos huecos se rellenan con 0 (un hueco no es un error)
+COLUMNAS_RELLENO = ['sales', 'onpromotion', 'transactions']
+
+
+def _numerica(serie):
+    # Devuelve (valores numéricos, máscara de valores presentes que no se pudieron convertir)
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie, np.zeros(len(serie), dtype=bool)
+    valores = pd.to_numeric(serie, errors='coerce')
+    return valores, (valores.isna() & serie.notna()).to_numpy()
+
+
+def _fechas(serie):
+    # Las fechas se repiten mucho (una por día y tienda/familia): solo se convierten los valores distintos
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+    codigos, unicos = pd.factorize(serie)
+    convertidas = pd.to_datetime(pd.Index(unicos), errors='coerce')
+    return pd.Series(convertidas.take(codigos, allow_fill=True, fill_value=pd.NaT), index=serie.index)
+
+
+def _tiendas_incoherentes(df, tienda_valida):
+    # Cada tienda debe tener una sola combinación (ciudad, estado, tipo): se toma como
+    # referencia la más frecuente y se marcan las filas que no coinciden con ella
+    columnas = ['store_nbr'] + [col for col in ['city', 'state', 'store_type'] if col in df.columns]
+    if len(columnas) == 1:
+        return np.zeros(len(df), dtype=bool)
+
+    grupos = df.groupby(columnas, dropna=False, sort=True)
+    codigo = grupos.ngroup().to_numpy()
+    tamanos = grupos.size().reset_index(name='n')
+    tamanos['codigo'] = np.arange(len(tamanos))
+
+    modales = tamanos.sort_values(['store_nbr', 'n'], ascending=[True, False], kind='stable').drop_duplicates('store_nbr')
+    return tienda_valida & ~np.isin(codigo, modales['codigo'].to_numpy())
+
+
+def validar_ventas(df):
+    # Devuelve (datos válidos con tipos corregidos, filas en cuarentena, informe)
+    n = len(df)
+    codigos = np.zeros(n, dtype=np.uint8)
+    limpio = df.copy()
+
+    # Fechas
+    if 'date' in df.columns:
+        fechas = _fechas(df['date'])
+        sin_fecha = fechas.isna().to_numpy()
+        codigos[sin_fecha] |= 1
+        fuera_rango = ~sin_fecha & ((fechas < FECHA_MIN) | (fechas > FECHA_MAX)).to_numpy()
+        codigos[fuera_rango] |= 2
+        limpio['date'] = fechas
+
+    # Tiendas
+    tienda_valida = np.ones(n, dtype=bool)
+    if 'store_nbr' in df.columns:
+        tiendas, _ = _numerica(df['store_nbr'])
+        valores = tiendas.to_numpy()
+        with np.errstate(invalid='ignore'):
+            tienda_valida = (valores == np.round(valores)) & (valores >= TIENDA_MIN) & (valores <= TIENDA_MAX)
+        codigos[~tienda_valida] |= 4
+        limpio['store_nbr'] = tiendas
+
+    # Columnas numéricas
+    rellenados = {}
+    reglas = {
+        'sales': (8, 16),
+        'onpromotion': (32, 32),
+        'transactions': (64, 64)
+    }
+    for col, (bit_tipo, bit_negativo) in reglas.items():
+        if col not in df.columns:
+            continue
+        valores, no_numerico = _numerica(df[col])
+        with np.errstate(invalid='ignore'):
+            negativo = (valores < 0).to_numpy()
+        codigos[no_numerico] |= bit_tipo
+        codigos[negativo] |= bit_negativo
+
+        if col in COLUMNAS_RELLENO:
+            huecos = valores.isna().to_numpy() & ~no_numerico
+            rellenados[col] = int(huecos.sum())
+            valores = valores.fillna(0)
+        limpio[col] = valores
+
+    if 'dcoilwtico' in df.columns:
+        limpio['dcoilwtico'], _ = _numerica(df['dcoilwtico'])
+
+    # Consistencia tienda -> ciudad / estado / tipo
+    if 'store_nbr' in df.columns:
+        codigos[_tiendas_incoherentes(df, tienda_valida)] |= 128
+
+    invalidas = codigos != 0
+    valido = limpio.loc[~invalidas]
+    if 'store_nbr' in valido.columns:
+        valido = valido.astype({'store_nbr': np.int64})
+    valido = valido.reset_index(drop=True)
+
+    # Cuarentena: filas originales con el motivo en texto (una traducción por código distinto)
+    cuarentena = df.loc[invalidas].copy()
+    codigos_invalidos = codigos[invalidas]
+    textos = {int(c): '; '.join(m for bit, m in MOTIVOS.items() if c & bit) for c in np.unique(codigos_invalidos)}
+    cuarentena['codigo_motivo'] = codigos_invalidos
+    cuarentena['motivo'] = pd.Series(codigos_invalidos, index=cuarentena.index).map(textos)
+
+    informe = {
+        'filas': n,
+        'validas': int(n - invalidas.sum()),
+        'cuarentena': int(invalidas.sum()),
+        'por_motivo': {m: int(((codigos & bit) != 0).sum()) for bit, m in MOTIVOS.items()},
+        'rellenados': rellenados
+    }
+
+    return valido, cuarentena, informe
+
+
+def guardar_cuarentena(cuarentena, informe, ruta=RUTA_CUARENTENA):
+    # Escribe las filas en cuarentena y un resumen con los conteos junto a ellas
+    ruta = Path(ruta)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    cuarentena.to_csv(ruta, index=False)
+    with open(ruta.with_name(ruta.stem + '_resumen.json'), 'w', encoding='utf-8') as f:
+        json.dump(informe, f, ensure_ascii=False, indent=2)
+    return ruta